@@ -0,0 +1,69 @@
+"""
+Per-request cost of authenticating a bearer token, with the verified-token
+cache disabled (`token_cache_size=0`) and enabled, measured on the dependency
+alone and on a role-protected endpoint.
+
+    python -m benchmarks.auth_overhead [requests]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import timedelta
+
+import httpx
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel
+
+from core.fastapi.auth import AuthEmail
+
+
+class User(BaseModel):
+    email: str
+    role: str = "admin"
+
+
+def create_app(auth: AuthEmail) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user: User = Depends(auth.get_request_user_with_roles(["admin"]))):
+        return {"email": user.email}
+
+    return app
+
+
+async def measure(token_cache_size: int, requests: int):
+    auth = AuthEmail("secret", User, token_cache_size=token_cache_size)
+    token = auth.create_jwt_token({"sub": "user@example.com"}, timedelta(hours=1))
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await auth.get_request_user(token)
+    dependency = (time.perf_counter() - started) / requests * 1e6
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(auth)),
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/me")
+            response.raise_for_status()
+        endpoint = (time.perf_counter() - started) / requests * 1e6
+
+    return dependency, endpoint
+
+
+async def main(requests: int = 2000):
+    for label, size in (("uncached", 0), ("cached", 10000)):
+        dependency, endpoint = await measure(size, requests)
+        print(
+            f"{label:>8}: dependency {dependency:7.1f} us/call, "
+            f"endpoint {endpoint:7.1f} us/request"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
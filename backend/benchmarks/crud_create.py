@@ -0,0 +1,114 @@
+"""
+Database round-trips and latency per create:
+unique pre-checks + add/commit/refresh vs a single INSERT ... RETURNING.
+
+`AddressQuery` has no unique columns, so only the refresh is saved there;
+`WatchedAddress` has a unique `address`, so its "refresh" path also runs the
+pre-check SELECT that INSERT ... RETURNING leaves to the unique index.
+
+Tables are created in a scratch schema that is dropped afterwards, so the
+`DATABASE_URL` database is left as it was.
+
+    DATABASE_URL=... python -m benchmarks.crud_create [creates]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from config.database_conf import Base
+from config.settings import DATABASE_URL
+from core.sqlalchemy.crud import Crud
+from core.sqlalchemy.orm import Orm
+from tables.address_query import AddressQuery
+from tables.watched_address import WatchedAddress
+
+SCHEMA = "benchmark_crud_create"
+
+QUERY_DATA = {
+    "address": "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz",
+    "balance": 104837000,
+    "bandwidth": 0,
+    "energy": 0,
+}
+
+
+def get_data(model, number: int) -> dict:
+    if model is WatchedAddress:
+        # Unique, so every create needs its own address
+        return {"address": f"T{number}"}
+
+    return QUERY_DATA
+
+
+async def create_with_refresh(model, data: dict, session):
+    await Crud.check_unique_fields(model, data, session)
+    return await Orm.create(model, data, session)
+
+
+async def create_returning(model, data: dict, session):
+    return await Orm.create_returning(model, data, session)
+
+
+async def run(engine, session_factory, create, model, creates: int, offset: int):
+    round_trips = 0
+
+    def count(*args):
+        nonlocal round_trips
+        round_trips += 1
+
+    for name in ("before_cursor_execute", "commit"):
+        event.listen(engine.sync_engine, name, count)
+
+    started = time.perf_counter()
+
+    for number in range(offset, offset + creates):
+        async with session_factory() as session:
+            await create(model, get_data(model, number), session)
+
+    elapsed = time.perf_counter() - started
+
+    for name in ("before_cursor_execute", "commit"):
+        event.remove(engine.sync_engine, name, count)
+
+    return round_trips / creates, elapsed / creates * 1000
+
+
+async def main(creates: int = 1000):
+    engine = create_async_engine(
+        DATABASE_URL, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    tables = [AddressQuery.__table__, WatchedAddress.__table__]
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+    try:
+        for model in (AddressQuery, WatchedAddress):
+            for offset, (name, create) in enumerate(
+                (("refresh", create_with_refresh), ("returning", create_returning))
+            ):
+                round_trips, latency = await run(
+                    engine, session_factory, create, model, creates, offset * creates
+                )
+                print(
+                    f"{model.__name__:>14} {name:>10}: {round_trips:.1f} round-trips, "
+                    f"{latency:.3f} ms per create"
+                )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,72 @@
+import asyncio
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def create_fake_node(latency: float = 0.0) -> FastAPI:
+    """
+    Fake TRON full-node that answers `wallet/getaccount` after `latency` seconds.
+    """
+    app = FastAPI()
+    app.state.latency = latency
+
+    @app.post("/wallet/getaccount")
+    async def get_account(request: Request):
+        data = await request.json()
+
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+
+        return {"address": data.get("address"), "balance": 104837000}
+
+    return app
+
+
+class FakeNodeServer:
+    """
+    Runs the fake full-node with uvicorn in a background thread.
+
+    Usage:
+        with FakeNodeServer(latency=0.01) as uri:
+            ...
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = self.get_free_port(host)
+        self.server = uvicorn.Server(
+            uvicorn.Config(
+                create_fake_node(latency),
+                host=host,
+                port=self.port,
+                log_level="warning",
+                access_log=False,
+            )
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @staticmethod
+    def get_free_port(host: str) -> int:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def uri(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def __enter__(self):
+        self.thread.start()
+
+        while not self.server.started:
+            time.sleep(0.01)
+
+        return self.uri
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.should_exit = True
+        self.thread.join()
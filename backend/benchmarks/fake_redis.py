@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from core.redis import RedisClient
+
+
+class FakeRedisServer:
+    """
+    In-process server speaking the Redis protocol, enough for the cache:
+    PING, GET, SET [PX|EX], DEL, INCR, DBSIZE and FLUSHDB.
+
+    Usage:
+        async with FakeRedisServer() as url:
+            ...
+    """
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = None
+        self.server = None
+
+        self.data: dict[bytes, tuple[bytes, float]] = {}
+        self.commands = 0
+
+    @property
+    def url(self):
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, self.host, 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        return self.url
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def get_value(self, key: bytes):
+        entry = self.data.get(key)
+
+        if entry is not None and entry[1] <= time.time():
+            del self.data[key]
+            entry = None
+
+        return None if entry is None else entry[0]
+
+    def execute(self, command: bytes, *args: bytes) -> bytes:
+        command = command.upper()
+
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"SELECT":
+            return b"+OK\r\n"
+        if command == b"GET":
+            value = self.get_value(args[0])
+            if value is None:
+                return b"$-1\r\n"
+
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            expires_at = float("inf")
+            options = [arg.upper() for arg in args[2:]]
+
+            if b"PX" in options:
+                expires_at = (
+                    time.time() + int(args[2 + options.index(b"PX") + 1]) / 1000
+                )
+            elif b"EX" in options:
+                expires_at = time.time() + int(args[2 + options.index(b"EX") + 1])
+
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(
+                self.data.pop(key, None) is not None for key in args
+            )
+        if command == b"INCR":
+            try:
+                value = int(self.get_value(args[0]) or 0) + 1
+            except ValueError:
+                return b"-ERR value is not an integer or out of range\r\n"
+
+            self.data[args[0]] = (str(value).encode(), float("inf"))
+            return b":%d\r\n" % value
+        if command == b"DBSIZE":
+            return b":%d\r\n" % len(self.data)
+        if command == b"FLUSHDB":
+            self.data.clear()
+            return b"+OK\r\n"
+
+        return b"-ERR unknown command '%s'\r\n" % command
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await RedisClient.read_reply(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    return
+
+                self.commands += 1
+                writer.write(self.execute(*request))
+                await writer.drain()
+        finally:
+            writer.close()
@@ -0,0 +1,77 @@
+"""
+Latency of GET /queries/latest lookups (Crud.latest) on a generated
+address_queries table: end to end through SQLAlchemy, and the execution
+time Postgres reports for the statement itself.
+
+    DATABASE_URL=... python -m benchmarks.latest_snapshot [rows] [addresses] [lookups]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from config.database_conf import Base, SessionLocal, engine
+from tables.address_query import AddressQuery
+from views import query_crud
+
+
+async def generate(rows: int, addresses: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=[AddressQuery.__table__])
+        await conn.run_sync(Base.metadata.create_all, tables=[AddressQuery.__table__])
+        await conn.execute(
+            text(
+                "INSERT INTO address_queries (address, balance, bandwidth, energy) "
+                "SELECT 'T' || (n % :addresses), n, 0, 0 "
+                "FROM generate_series(1, :rows) n"
+            ),
+            {"rows": rows, "addresses": addresses},
+        )
+        await conn.execute(text("ANALYZE address_queries"))
+
+
+async def time_lookups(batch: int, addresses: int, lookups: int):
+    timings = []
+
+    async with SessionLocal() as session:
+        for _ in range(lookups):
+            keys = [f"T{random.randrange(addresses)}" for _ in range(batch)]
+
+            started = time.perf_counter()
+            await query_crud.latest(session, "address", keys)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+async def explain_lookup(batch: int, addresses: int):
+    keys = [f"T{random.randrange(addresses)}" for _ in range(batch)]
+    sql = query_crud.get_latest_query("address", keys).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+    async with SessionLocal() as session:
+        execution = await session.execute(text(f"EXPLAIN ANALYZE {sql}"))
+
+    return execution.scalars().all()[-1]
+
+
+async def main(rows: int = 10_000_000, addresses: int = 100_000, lookups: int = 1000):
+    await generate(rows, addresses)
+
+    for batch in (1, 100):
+        p50, p99 = await time_lookups(batch, addresses, lookups)
+        explained = await explain_lookup(batch, addresses)
+        print(f"{batch:>4} addresses: p50 {p50:.3f} ms, p99 {p99:.3f} ms, {explained}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
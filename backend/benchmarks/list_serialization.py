@@ -0,0 +1,86 @@
+"""
+Rows per second for one page of GET /queries/: the ORM path (objects
+validated against QueryPageModel, then JSON-encoded as FastAPI does) against
+the row path (column mappings encoded with orjson).
+
+    DATABASE_URL=... python -m benchmarks.list_serialization [repeats]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+from config.database_conf import Base, SessionLocal, engine
+from core.fastapi.responses import dump_json
+from models.address_query import QueryPageModel, get_query_row
+from tables.address_query import AddressQuery
+from views import query_crud
+
+PAGE_SIZES = (1000, 10000)
+
+
+async def generate(rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=[AddressQuery.__table__])
+        await conn.run_sync(Base.metadata.create_all, tables=[AddressQuery.__table__])
+        await conn.execute(
+            text(
+                "INSERT INTO address_queries (address, balance, bandwidth, energy) "
+                "SELECT 'T' || n, n * 1000, 0, 0 FROM generate_series(1, :rows) n"
+            ),
+            {"rows": rows},
+        )
+
+
+async def orm_page(limit: int) -> bytes:
+    async with SessionLocal() as session:
+        items, next_cursor = await query_crud.paginate(session, limit)
+
+    page = QueryPageModel.model_validate(
+        {"items": items, "next_cursor": next_cursor}, from_attributes=True
+    )
+    return json.dumps(jsonable_encoder(page.model_dump(mode="json"))).encode()
+
+
+async def row_page(limit: int) -> bytes:
+    async with SessionLocal() as session:
+        items, next_cursor = await query_crud.paginate(session, limit, as_rows=True)
+
+    return dump_json(
+        {"items": [get_query_row(item) for item in items], "next_cursor": next_cursor}
+    )
+
+
+async def time_page(page, limit: int, repeats: int):
+    await page(limit)
+    started = time.perf_counter()
+
+    for _ in range(repeats):
+        await page(limit)
+
+    return limit * repeats / (time.perf_counter() - started)
+
+
+async def main(repeats: int = 20):
+    await generate(max(PAGE_SIZES) + 1)
+
+    orm_body, row_body = await orm_page(10), await row_page(10)
+    assert json.loads(orm_body) == json.loads(row_body), (orm_body, row_body)
+
+    for limit in PAGE_SIZES:
+        orm = await time_page(orm_page, limit, repeats)
+        rows = await time_page(row_page, limit, repeats)
+        print(
+            f"{limit:>6} rows: ORM {orm:10.0f} rows/s, "
+            f"row mappings {rows:10.0f} rows/s ({rows / orm:.1f}x)"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
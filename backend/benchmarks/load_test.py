@@ -0,0 +1,279 @@
+"""
+Open-loop load test of POST and GET /queries/ against a local Postgres and a
+fake TRON full-node with configurable latency.
+
+The app runs under uvicorn in a child process; requests are sent at a fixed
+rate and latency counts from when each request was due, so a slow server is
+not hidden by the client waiting on it. Results can be saved as a baseline
+and later runs compared against it; baselines are only comparable on the
+same machine and with the same options.
+
+    DATABASE_URL=... alembic upgrade head
+    DATABASE_URL=... python -m benchmarks.load_test [--rps 100] [--duration 10]
+        [--latency 0.05] [--save benchmarks/baselines/load_test.json]
+        [--baseline benchmarks/baselines/load_test.json] [--tolerance 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from tronpy.keys import PrivateKey
+
+from benchmarks.fake_node import FakeNodeServer
+
+OPERATIONS = {
+    "POST /queries/": ("POST", "/queries/"),
+    "GET /queries/": ("GET", "/queries/"),
+}
+
+# Every option that affects the numbers; reports are only compared when equal
+RUN_OPTIONS = (
+    "rps",
+    "duration",
+    "latency",
+    "post_ratio",
+    "seed",
+    "addresses",
+    "connections",
+)
+
+
+def get_addresses(count: int) -> list:
+    return [
+        PrivateKey.random().public_key.to_base58check_address() for _ in range(count)
+    ]
+
+
+def start_app(node_uri: str, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "TRON_PROVIDER_URI": node_uri,
+        "WATCH_ENABLED": "false",
+        "LOG_LEVEL": "warning",
+    }
+
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, process: subprocess.Popen):
+    while process.poll() is None:
+        try:
+            await client.get("/metrics")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+
+    raise RuntimeError(f"App exited with code {process.returncode}")
+
+
+async def seed(client: httpx.AsyncClient, addresses: list, rows: int):
+    for start in range(0, rows, 100):
+        batch = random.choices(addresses, k=min(100, rows - start))
+        response = await client.post("/queries/batch", json={"addresses": batch})
+        response.raise_for_status()
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    addresses: list,
+    rps: float,
+    duration: float,
+    post_ratio: float,
+) -> dict:
+    results = {name: {"timings": [], "errors": 0} for name in OPERATIONS}
+
+    async def send(name: str, intended: float):
+        method, path = OPERATIONS[name]
+        params = (
+            {"address": random.choice(addresses)} if method == "POST" else {"limit": 20}
+        )
+
+        try:
+            response = await client.request(method, path, params=params)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+
+        if failed:
+            results[name]["errors"] += 1
+        else:
+            results[name]["timings"].append(time.perf_counter() - intended)
+
+    tasks = []
+    interval = 1 / rps
+    started = intended = time.perf_counter()
+
+    while intended - started < duration:
+        name = "POST /queries/" if random.random() < post_ratio else "GET /queries/"
+        tasks.append(asyncio.create_task(send(name, intended)))
+
+        intended += interval
+        await asyncio.sleep(max(0.0, intended - time.perf_counter()))
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    return {
+        name: summarize(result["timings"], result["errors"], elapsed)
+        for name, result in results.items()
+    }
+
+
+def summarize(timings: list, errors: int, elapsed: float) -> dict:
+    if len(timings) < 2:
+        return {"requests": len(timings), "errors": errors}
+
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput": len(timings) / elapsed,
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns the regressions of `report` against `baseline`: lower throughput or
+    higher p50/p95/p99 by more than `tolerance`, or any new errors.
+
+    Reports run with different options are not compared at all; the
+    differing options are returned as the only regression instead.
+    """
+    differences = [
+        f"{key} {baseline['options'].get(key)} -> {report['options'].get(key)}"
+        for key in RUN_OPTIONS
+        if report["options"].get(key) != baseline["options"].get(key)
+    ]
+
+    if differences:
+        return [
+            f"options differ from the baseline ({', '.join(differences)}), "
+            "numbers are not comparable"
+        ]
+
+    regressions = []
+
+    for name, expected in baseline["results"].items():
+        actual = report["results"].get(name, {})
+
+        if actual.get("errors", 0) > expected.get("errors", 0):
+            regressions.append(f"{name}: {actual['errors']} errors")
+
+        if actual.get("throughput", 0) < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {actual.get('throughput', 0):.1f}/s, "
+                f"baseline {expected['throughput']:.1f}/s"
+            )
+
+        for key in ("p50", "p95", "p99"):
+            if actual.get(key, float("inf")) > expected[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} {actual.get(key, float('inf')):.1f} ms, "
+                    f"baseline {expected[key]:.1f} ms"
+                )
+
+    return regressions
+
+
+def print_report(report: dict):
+    for name, result in report["results"].items():
+        if "throughput" not in result:
+            print(f"{name:>15}: {result['requests']} ok, {result['errors']} errors")
+            continue
+
+        print(
+            f"{name:>15}: {result['throughput']:7.1f} req/s, "
+            f"p50 {result['p50']:7.2f} ms, p95 {result['p95']:7.2f} ms, "
+            f"p99 {result['p99']:7.2f} ms, {result['errors']} errors"
+        )
+
+
+async def run(options: argparse.Namespace, node_uri: str) -> dict:
+    port = FakeNodeServer.get_free_port("127.0.0.1")
+    process = start_app(node_uri, port)
+    addresses = get_addresses(options.addresses)
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=options.connections),
+            timeout=30,
+        ) as client:
+            await wait_ready(client, process)
+            await seed(client, addresses, options.seed)
+
+            await drive(client, addresses, options.rps, 1, options.post_ratio)
+            results = await drive(
+                client, addresses, options.rps, options.duration, options.post_ratio
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "options": {key: getattr(options, key) for key in RUN_OPTIONS},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--post-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--addresses", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--save", help="write the report to this baseline file")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    options = parser.parse_args()
+
+    with FakeNodeServer(options.latency) as node_uri:
+        report = asyncio.run(run(options, node_uri))
+
+    print_report(report)
+
+    if options.save:
+        with open(options.save, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compare(report, json.load(file), options.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-call cost of printl before (traceback.extract_stack + synchronous print)
+and after (queued structured logger), plus a call below the log level.
+
+    python -m benchmarks.logging_overhead [iterations]
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import traceback
+from datetime import datetime
+from time import perf_counter
+
+from core import loggers
+
+
+def legacy_printl(*args, separator=", "):
+    stack = traceback.extract_stack()[:-1]
+    caller_frame = stack[-1]
+
+    _now = datetime.now(loggers.timezone).strftime("%H:%M %d.%m.%y")
+
+    args_str = separator.join(str(arg) for arg in args)
+    location_str = f"[{_now}:{caller_frame.filename}:{caller_frame.lineno}]"
+
+    print(f"{args_str} {location_str}")
+
+
+def time_calls(log, iterations: int):
+    started = perf_counter()
+
+    for number in range(iterations):
+        log("Flushed rows", number)
+
+    return (perf_counter() - started) / iterations
+
+
+def main(iterations: int = 20000):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        loggers.stream_handler.setStream(devnull)
+
+        results = {
+            "legacy printl": time_calls(legacy_printl, iterations),
+            "printl": time_calls(loggers.printl, iterations),
+            "logger.debug (disabled)": time_calls(
+                lambda *args: loggers.logger.debug("Flushed rows", number=args[1]),
+                iterations,
+            ),
+        }
+
+        loggers.listener.stop()
+
+    for name, seconds in results.items():
+        print(f"{name:>24}: {seconds * 1e6:8.2f} us per call")
+
+
+if __name__ == "__main__":
+    assert loggers.logger.level > logging.DEBUG, "run with LOG_LEVEL above DEBUG"
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Latency of a trivial endpoint while a burst of logins verifies bcrypt hashes,
+with verification on the event loop (`verify_password`) and in the hashing
+pool (`verify_password_async`).
+
+    python -m benchmarks.login_burst [logins] [rounds]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from core.fastapi.auth import AuthEmail
+
+
+def create_app(auth: AuthEmail, hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/sync")
+    async def login_sync():
+        return {"valid": auth.verify_password("password", hashed)}
+
+    @app.post("/login/async")
+    async def login_async():
+        return {"valid": await auth.verify_password_async("password", hashed)}
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+
+async def measure(app: FastAPI, mode: str, logins: int, interval: float = 0.01):
+    timings = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def ping(intended: float):
+            await client.get("/ping")
+            timings.append((time.perf_counter() - intended) * 1000)
+
+        burst = asyncio.gather(*(client.post(f"/login/{mode}") for _ in range(logins)))
+        pings = []
+        intended = time.perf_counter()
+
+        # Latency counts from when a ping was due, so a blocked loop is not hidden
+        while not burst.done():
+            pings.append(asyncio.create_task(ping(intended)))
+            intended += interval
+            await asyncio.sleep(max(0.0, intended - time.perf_counter()))
+
+        await burst
+        await asyncio.gather(*pings)
+
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)], len(timings)
+
+
+async def main(logins: int = 20, rounds: int = 12):
+    auth = AuthEmail("secret", dict, bcrypt_rounds=rounds, hash_concurrency=logins)
+    app = create_app(auth, auth.get_password_hash("password"))
+
+    for mode in ("sync", "async"):
+        p50, p99, pings = await measure(app, mode, logins)
+        print(f"{mode:>5}: ping p50 {p50:8.2f} ms, p99 {p99:8.2f} ms ({pings} pings)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,60 @@
+"""
+Cost of the metrics instrumentation: one histogram observation and the
+MetricsMiddleware wrapped around a trivial ASGI app.
+
+    python -m benchmarks.metrics_overhead [iterations]
+"""
+
+import asyncio
+import sys
+from time import perf_counter
+
+from core.fastapi.metrics import MetricsMiddleware
+from core.metrics import Histogram
+
+SCOPE = {"type": "http", "method": "GET", "path": "/"}
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def time_app(app, iterations: int):
+    started = perf_counter()
+
+    for _ in range(iterations):
+        await app(dict(SCOPE), receive, send)
+
+    return (perf_counter() - started) / iterations
+
+
+def time_observe(iterations: int):
+    histogram = Histogram("benchmark", "", ("method", "route", "status"))
+    started = perf_counter()
+
+    for _ in range(iterations):
+        histogram.observe(0.003, "GET", "/queries/", 200)
+
+    return (perf_counter() - started) / iterations
+
+
+async def main(iterations: int = 200000):
+    observe = time_observe(iterations)
+    plain = await time_app(plain_app, iterations)
+    instrumented = await time_app(MetricsMiddleware(plain_app), iterations)
+
+    print(f"Histogram.observe: {observe * 1e9:8.0f} ns")
+    print(f"middleware overhead: {(instrumented - plain) * 1e9:6.0f} ns per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,51 @@
+"""
+Lookups per second against a local fake full-node:
+one-off client per lookup vs the shared pooled client.
+
+    python -m benchmarks.tron_client [lookups] [concurrency] [latency]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.fake_node import FakeNodeServer
+
+ADDRESS = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+
+async def run(lookups: int, concurrency: int, shared: bool):
+    from services.tron import create_tron_client, get_tron_info
+
+    tron = create_tron_client() if shared else None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup():
+        async with semaphore:
+            await get_tron_info(ADDRESS, tron)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(lookup() for _ in range(lookups)))
+    elapsed = time.perf_counter() - started
+
+    if tron:
+        await tron.close()
+
+    return lookups / elapsed
+
+
+async def compare(lookups: int, concurrency: int):
+    for name, shared in (("per-call client", False), ("shared client", True)):
+        rate = await run(lookups, concurrency, shared)
+        print(f"{name:>16}: {rate:8.1f} lookups/s")
+
+
+def main(lookups: int = 2000, concurrency: int = 20, latency: float = 0.0):
+    with FakeNodeServer(latency) as uri:
+        os.environ["TRON_PROVIDER_URI"] = uri
+        asyncio.run(compare(lookups, concurrency))
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, int, float), sys.argv[1:])))
@@ -1,15 +1,86 @@
+import time
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from config.settings import DATABASE_URL
+from config.settings import (
+    DATABASE_URL,
+    DB_EXPIRE_ON_COMMIT,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_SLOW_QUERY_MS,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from core.sqlalchemy.query_stats import instrument_engine
 
 Base = declarative_base()
 
+pool_wait_stats = {"checkouts": 0, "wait_total": 0.0, "wait_max": 0.0}
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each connection checkout waited.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+
+        try:
+            return super().connect()
+        finally:
+            wait = time.perf_counter() - started
+
+            pool_wait_stats["checkouts"] += 1
+            pool_wait_stats["wait_total"] += wait
+            pool_wait_stats["wait_max"] = max(pool_wait_stats["wait_max"], wait)
+
+
 if DATABASE_URL:
-    engine = create_async_engine(DATABASE_URL, future=True)
-    SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, future=True)
+    engine = create_async_engine(
+        DATABASE_URL,
+        future=True,
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+    )
+    instrument_engine(engine, DB_SLOW_QUERY_MS / 1000)
+    SessionLocal = sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        future=True,
+        expire_on_commit=DB_EXPIRE_ON_COMMIT,
+    )
 
 
 async def get_session():
     async with SessionLocal() as session:
         yield session
+
+
+def get_query_buffer(request: Request):
+    return getattr(request.app.state, "query_buffer", None)
+
+
+def get_pool_stats():
+    pool = engine.pool
+    checkouts = pool_wait_stats["checkouts"]
+
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "wait_avg": pool_wait_stats["wait_total"] / checkouts if checkouts else 0.0,
+        "wait_max": pool_wait_stats["wait_max"],
+    }
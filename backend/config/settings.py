@@ -1,3 +1,61 @@
 from os import environ
 
 DATABASE_URL = environ.get("DATABASE_URL")
+
+LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
+DEBUG = environ.get("DEBUG", "false").lower() == "true"
+
+DB_POOL_SIZE = int(environ.get("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(environ.get("DB_STATEMENT_CACHE_SIZE", 100))
+DB_EXPIRE_ON_COMMIT = environ.get("DB_EXPIRE_ON_COMMIT", "false").lower() == "true"
+DB_SLOW_QUERY_MS = float(environ.get("DB_SLOW_QUERY_MS", 500))
+
+QUERIES_PAGE_SIZE = int(environ.get("QUERIES_PAGE_SIZE", 100))
+QUERIES_MAX_PAGE_SIZE = int(environ.get("QUERIES_MAX_PAGE_SIZE", 1000))
+LATEST_MAX_ADDRESSES = int(environ.get("LATEST_MAX_ADDRESSES", 1000))
+EXPORT_CHUNK_SIZE = int(environ.get("EXPORT_CHUNK_SIZE", 1000))
+QUERIES_CACHE_TTL = float(environ.get("QUERIES_CACHE_TTL", 5))
+QUERIES_CACHE_SIZE = int(environ.get("QUERIES_CACHE_SIZE", 1000))
+AGGREGATES_CACHE_TTL = float(environ.get("AGGREGATES_CACHE_TTL", 30))
+AGGREGATES_CACHE_SIZE = int(environ.get("AGGREGATES_CACHE_SIZE", 1000))
+AGGREGATES_MAX_ADDRESSES = int(environ.get("AGGREGATES_MAX_ADDRESSES", 1000))
+
+QUERIES_WRITE_BEHIND = environ.get("QUERIES_WRITE_BEHIND", "false").lower() == "true"
+QUERIES_FLUSH_ROWS = int(environ.get("QUERIES_FLUSH_ROWS", 500))
+QUERIES_FLUSH_INTERVAL_MS = int(environ.get("QUERIES_FLUSH_INTERVAL_MS", 200))
+QUERIES_BUFFER_SIZE = int(environ.get("QUERIES_BUFFER_SIZE", 10000))
+
+CACHE_BACKEND = environ.get("CACHE_BACKEND", "memory")
+CACHE_SQLITE_PATH = environ.get("CACHE_SQLITE_PATH")
+CACHE_SQLITE_SIZE = int(environ.get("CACHE_SQLITE_SIZE", 100000))
+CACHE_REDIS_URL = environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_POOL_SIZE = int(environ.get("CACHE_REDIS_POOL_SIZE", 10))
+CACHE_REDIS_TIMEOUT = float(environ.get("CACHE_REDIS_TIMEOUT", 1))
+
+AUTH_BCRYPT_ROUNDS = int(environ.get("AUTH_BCRYPT_ROUNDS", 12))
+AUTH_HASH_WORKERS = int(environ.get("AUTH_HASH_WORKERS", 2))
+AUTH_HASH_CONCURRENCY = int(environ.get("AUTH_HASH_CONCURRENCY", 8))
+AUTH_HASH_WAIT = float(environ.get("AUTH_HASH_WAIT", 2))
+AUTH_TOKEN_CACHE_SIZE = int(environ.get("AUTH_TOKEN_CACHE_SIZE", 10000))
+
+TRON_NETWORK = environ.get("TRON_NETWORK", "mainnet")
+TRON_PROVIDER_URI = environ.get("TRON_PROVIDER_URI")
+TRON_API_KEY = environ.get("TRON_API_KEY")
+TRON_MAX_CONCURRENCY = int(environ.get("TRON_MAX_CONCURRENCY", 20))
+TRON_POOL_SIZE = int(environ.get("TRON_POOL_SIZE", 20))
+TRON_KEEPALIVE_EXPIRY = float(environ.get("TRON_KEEPALIVE_EXPIRY", 30))
+TRON_TIMEOUT = float(environ.get("TRON_TIMEOUT", 10))
+TRON_CACHE_TTL = float(environ.get("TRON_CACHE_TTL", 5))
+TRON_CACHE_SIZE = int(environ.get("TRON_CACHE_SIZE", 10000))
+TRON_BATCH_MAX_SIZE = int(environ.get("TRON_BATCH_MAX_SIZE", 1000))
+TRON_BATCH_CONCURRENCY = int(environ.get("TRON_BATCH_CONCURRENCY", 10))
+
+WATCH_ENABLED = environ.get("WATCH_ENABLED", "false").lower() == "true"
+WATCH_INTERVAL = float(environ.get("WATCH_INTERVAL", 60))
+WATCH_CONCURRENCY = int(environ.get("WATCH_CONCURRENCY", 10))
+WATCH_JITTER = float(environ.get("WATCH_JITTER", 5))
+WATCH_BATCH_SIZE = int(environ.get("WATCH_BATCH_SIZE", 500))
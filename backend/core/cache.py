@@ -0,0 +1,455 @@
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+import orjson
+
+from config.settings import (
+    CACHE_BACKEND,
+    CACHE_REDIS_POOL_SIZE,
+    CACHE_REDIS_TIMEOUT,
+    CACHE_REDIS_URL,
+    CACHE_SQLITE_PATH,
+    CACHE_SQLITE_SIZE,
+)
+from core.fastapi.responses import dump_json
+from core.loggers import logger
+from core.redis import RedisClient
+
+
+def encode_entry(stored_at: float, value) -> bytes:
+    return dump_json([stored_at, value])
+
+
+def decode_entry(data: bytes):
+    """
+    Reverse of `encode_entry`; anything else, like an entry written by an
+    older release, reads as a miss.
+    """
+    try:
+        stored_at, value = orjson.loads(data)
+    except (ValueError, TypeError):
+        return None
+
+    return stored_at, value
+
+
+class MemoryBackend:
+    """
+    Per-process LRU storage. Values are kept as Python objects, without
+    serialization.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+
+        self.data: OrderedDict[str, tuple[float, float, Any]] = OrderedDict()
+        self.counters: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    async def get(self, key: str):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, stored_at, value = entry
+
+        if time.time() >= expires_at:
+            del self.data[key]
+            return None
+
+        self.data.move_to_end(key)
+        return stored_at, value
+
+    async def set(self, key: str, value, ttl: float) -> int:
+        now = time.time()
+
+        self.data[key] = (now + ttl, now, value)
+        self.data.move_to_end(key)
+
+        evicted = 0
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            evicted += 1
+
+        return evicted
+
+    async def delete(self, key: str):
+        self.data.pop(key, None)
+
+    async def get_counter(self, key: str) -> int:
+        return self.counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    async def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """
+    File storage shared by all workers on one host.
+
+    Entries are stored as JSON `[stored_at, value]` arrays, so values must be
+    plain JSON data and come back as such: tuples as lists, datetimes and
+    Decimals as strings. Statements run in a dedicated thread so lock waits never block the event loop.
+    """
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, maxsize: int):
+        self.path = path
+        self.maxsize = maxsize
+
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="sqlite-cache")
+        self.connection: Optional[sqlite3.Connection] = None
+        self.writes = 0
+
+    def connect(self):
+        if self.connection is not None:
+            return self.connection
+
+        connection = sqlite3.connect(
+            self.path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_expires_at ON cache (expires_at)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS counters "
+            "(key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+        self.connection = connection
+        return connection
+
+    async def run(self, func: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+    def get_sync(self, key: str):
+        row = (
+            self.connect()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+
+        return None if row is None else decode_entry(row[0])
+
+    def set_sync(self, key: str, value, ttl: float):
+        now = time.time()
+        connection = self.connect()
+
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+            (key, now + ttl, encode_entry(now, value)),
+        )
+
+        self.writes += 1
+        if self.writes % self.PURGE_EVERY == 0:
+            self.purge_sync(now)
+
+    def purge_sync(self, now: float):
+        connection = self.connect()
+
+        connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        connection.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+            "ORDER BY expires_at LIMIT max(0, (SELECT count(*) FROM cache) - ?))",
+            (self.maxsize,),
+        )
+
+    def get_counter_sync(self, key: str) -> int:
+        row = (
+            self.connect()
+            .execute("SELECT value FROM counters WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+        return 0 if row is None else row[0]
+
+    def incr_sync(self, key: str) -> int:
+        return (
+            self.connect()
+            .execute(
+                "INSERT INTO counters (key, value) VALUES (?, 1) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + 1 RETURNING value",
+                (key,),
+            )
+            .fetchone()[0]
+        )
+
+    async def get(self, key: str):
+        return await self.run(self.get_sync, key)
+
+    async def set(self, key: str, value, ttl: float) -> int:
+        await self.run(self.set_sync, key, value, ttl)
+        return 0
+
+    async def delete(self, key: str):
+        await self.run(
+            lambda: self.connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+        )
+
+    async def get_counter(self, key: str) -> int:
+        return await self.run(self.get_counter_sync, key)
+
+    async def incr(self, key: str) -> int:
+        return await self.run(self.incr_sync, key)
+
+    async def close(self):
+        if self.connection is not None:
+            await self.run(self.connection.close)
+            self.connection = None
+
+
+class RedisBackend:
+    """
+    Storage on a Redis-protocol server, shared by all workers and hosts.
+
+    Entries are JSON like in `SQLiteBackend` and expire server-side
+    (`SET ... PX`).
+    """
+
+    def __init__(self, client: RedisClient):
+        self.client = client
+
+    async def get(self, key: str):
+        value = await self.client.execute("GET", key)
+        return None if value is None else decode_entry(value)
+
+    async def set(self, key: str, value, ttl: float) -> int:
+        await self.client.execute(
+            "SET",
+            key,
+            encode_entry(time.time(), value),
+            "PX",
+            max(1, int(ttl * 1000)),
+        )
+        return 0
+
+    async def delete(self, key: str):
+        await self.client.execute("DEL", key)
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self.client.execute("GET", key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.execute("INCR", key)
+
+    async def close(self):
+        await self.client.close()
+
+
+shared_backend = None
+
+
+def get_shared_backend():
+    """
+    Returns the process-wide backend selected by `CACHE_BACKEND`, or None for
+    "memory", in which case every cache keeps its own LRU.
+    """
+    global shared_backend
+
+    if shared_backend is None and CACHE_BACKEND == "sqlite":
+        if not CACHE_SQLITE_PATH:
+            raise ValueError("CACHE_SQLITE_PATH is required with CACHE_BACKEND=sqlite")
+
+        shared_backend = SQLiteBackend(CACHE_SQLITE_PATH, CACHE_SQLITE_SIZE)
+    elif shared_backend is None and CACHE_BACKEND == "redis":
+        shared_backend = RedisBackend(
+            RedisClient(CACHE_REDIS_URL, CACHE_REDIS_POOL_SIZE, CACHE_REDIS_TIMEOUT)
+        )
+
+    return shared_backend
+
+
+async def close_shared_backend():
+    global shared_backend
+
+    if shared_backend is not None:
+        await shared_backend.close()
+        shared_backend = None
+
+
+class TTLCache:
+    """
+    Cache whose entries expire `ttl` seconds after being stored.
+
+    Entries live in `backend`, a per-process LRU of `maxsize` entries by
+    default. Concurrent `get_or_fetch` calls for the same missing key in one
+    process share one fetch.
+
+    With `versioned=True` keys include a generation counter kept in the
+    backend, so `invalidate()` drops every entry for all workers at once; it
+    costs one extra backend read per lookup.
+
+    Backend errors are logged and counted but never raised: lookups fall back
+    to `fetch()` and failed writes are skipped, so an unavailable cache only
+    costs speed.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int,
+        backend=None,
+        namespace: str = "cache",
+        versioned: bool = False,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self.backend = MemoryBackend(maxsize) if backend is None else backend
+        self.namespace = namespace
+        self.versioned = versioned
+
+        self.in_flight: dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def __len__(self):
+        return len(self.backend)
+
+    def get_stats(self) -> dict:
+        if isinstance(self.backend, MemoryBackend):
+            return {**self.stats, "size": len(self.backend)}
+
+        return dict(self.stats)
+
+    async def get_key(self, key: Hashable) -> str:
+        key = key if isinstance(key, str) else repr(key)
+
+        if not self.versioned:
+            return f"{self.namespace}:{key}"
+
+        generation = await self.backend.get_counter(f"{self.namespace}:generation")
+        return f"{self.namespace}:{generation}:{key}"
+
+    async def get(self, key: Hashable):
+        """
+        Method that returns a fresh entry and its age.
+
+        :return:
+            `Tuple of value and age in seconds, or None if missing or expired.`
+        """
+        try:
+            entry = await self.backend.get(await self.get_key(key))
+        except Exception:
+            self.log_backend_error("get")
+            return None
+
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        return value, max(0.0, time.time() - stored_at)
+
+    async def set(self, key: Hashable, value):
+        try:
+            backend_key = await self.get_key(key)
+        except Exception:
+            self.log_backend_error("set")
+            return
+
+        await self.store(backend_key, value)
+
+    async def store(self, backend_key: str, value):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+
+        try:
+            evicted = await self.backend.set(backend_key, value, self.ttl)
+        except Exception:
+            self.log_backend_error("set")
+            return
+
+        self.stats["evictions"] += evicted
+
+    async def invalidate(self, key: Hashable = None):
+        try:
+            if key is not None:
+                await self.backend.delete(await self.get_key(key))
+            elif self.versioned:
+                await self.backend.incr(f"{self.namespace}:generation")
+            elif isinstance(self.backend, MemoryBackend):
+                self.backend.data.clear()
+        except Exception:
+            self.log_backend_error("invalidate")
+
+    def log_backend_error(self, operation: str):
+        self.stats["errors"] += 1
+        logger.warning(
+            "Cache backend failed",
+            namespace=self.namespace,
+            operation=operation,
+            exc_info=True,
+        )
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable]):
+        """
+        Method that returns a cached value or fetches and stores it.
+
+        :param:
+        - `key`: Cache key.
+        - `fetch`: Coroutine function producing the value on a miss.
+
+        :return:
+            `Tuple of value, whether it came from the cache and its age in seconds.`
+        """
+        try:
+            backend_key = await self.get_key(key)
+            entry = await self.backend.get(backend_key)
+        except Exception:
+            self.log_backend_error("get")
+            self.stats["misses"] += 1
+
+            return await fetch(), False, 0.0
+
+        if entry is not None:
+            self.stats["hits"] += 1
+            stored_at, value = entry
+            return value, True, max(0.0, time.time() - stored_at)
+
+        self.stats["misses"] += 1
+        task = self.in_flight.get(backend_key)
+
+        if task is None:
+            task = asyncio.ensure_future(self.fetch_and_store(backend_key, fetch))
+            self.in_flight[backend_key] = task
+        else:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task), False, 0.0
+
+    async def fetch_and_store(self, backend_key: str, fetch: Callable[[], Awaitable]):
+        try:
+            value = await fetch()
+            await self.store(backend_key, value)
+
+            return value
+        finally:
+            self.in_flight.pop(backend_key, None)
@@ -1,4 +1,10 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
+from typing import Callable, Optional
 
 import jwt
 from fastapi import Depends, HTTPException
@@ -6,9 +12,86 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import InvalidTokenError
 from passlib.context import CryptContext
 
+from config.settings import (
+    AUTH_BCRYPT_ROUNDS,
+    AUTH_HASH_CONCURRENCY,
+    AUTH_HASH_WAIT,
+    AUTH_HASH_WORKERS,
+    AUTH_TOKEN_CACHE_SIZE,
+)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login/")
 
 
+class TokenCache:
+    """
+    Bounded LRU of verified tokens and their claims.
+
+    An entry is dropped once the token's `exp` passes. Revoked tokens are
+    remembered until their `exp` so they are refused although their signature
+    is still valid; revocation is local to the process.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+
+        self.data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.revoked: dict[str, float] = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self.data.get(token)
+        if entry is None:
+            return None
+
+        expires_at, claims = entry
+
+        if time.time() >= expires_at:
+            del self.data[token]
+            return None
+
+        self.data.move_to_end(token)
+        return claims
+
+    def set(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+
+        # Tokens without exp would stay valid in the cache forever
+        if self.maxsize <= 0 or not isinstance(expires_at, (int, float)):
+            return
+
+        self.data[token] = (expires_at, claims)
+        self.data.move_to_end(token)
+
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def invalidate(self, token: str = None):
+        if token is None:
+            self.data.clear()
+        else:
+            self.data.pop(token, None)
+
+    def revoke(self, token: str, expires_at: float):
+        self.invalidate(token)
+
+        now = time.time()
+        self.revoked = {
+            revoked: revoked_until
+            for revoked, revoked_until in self.revoked.items()
+            if revoked_until > now
+        }
+        self.revoked[token] = expires_at
+
+    def is_revoked(self, token: str) -> bool:
+        if not self.revoked:
+            return False
+
+        return self.revoked.get(token, 0) > time.time()
+
+
 class AuthEmail:
     def __init__(
         self,
@@ -17,6 +100,11 @@ class AuthEmail:
         algorithm: str = "HS256",
         access_token_expire_hours: int = 24,
         refresh_token_expire_days: int = 7,
+        bcrypt_rounds: int = AUTH_BCRYPT_ROUNDS,
+        hash_workers: int = AUTH_HASH_WORKERS,
+        hash_concurrency: int = AUTH_HASH_CONCURRENCY,
+        hash_wait: float = AUTH_HASH_WAIT,
+        token_cache_size: int = AUTH_TOKEN_CACHE_SIZE,
     ):
         self.secret_key = secret_key
         self.algorithm = algorithm
@@ -24,9 +112,21 @@ class AuthEmail:
         self.access_token_expire = timedelta(hours=access_token_expire_hours)
         self.refresh_token_expire = timedelta(days=refresh_token_expire_days)
 
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # Hashes made with other rounds are reported by `needs_update`
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=bcrypt_rounds
+        )
         self.user_model = user_model
 
+        # bcrypt releases the GIL, so threads keep hashing off the event loop
+        self.hash_executor = ThreadPoolExecutor(
+            hash_workers, thread_name_prefix="password-hash"
+        )
+        self.hash_semaphore = asyncio.Semaphore(hash_concurrency)
+        self.hash_wait = hash_wait
+
+        self.token_cache = TokenCache(token_cache_size)
+
     def create_jwt_token(self, data: dict, expires_delta: timedelta):
         to_encode = data.copy()
         expire = datetime.now() + expires_delta
@@ -35,9 +135,39 @@ class AuthEmail:
 
         return jwt.encode(to_encode, self.secret_key, self.algorithm)
 
-    def get_request_user(self, token: str = Depends(oauth2_scheme)):
+    def decode_token(self, token: str) -> dict:
+        """
+        Method that returns the claims of a valid token.
+
+        Verified tokens are kept in `token_cache` until they expire, so a reused
+        token skips the signature check.
+
+        :return:
+            `Token claims.`
+        """
+        claims = self.token_cache.get(token)
+        if claims is not None:
+            return claims
+
+        if self.token_cache.is_revoked(token):
+            raise InvalidTokenError("Token has been revoked")
+
+        claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        self.token_cache.set(token, claims)
+
+        return claims
+
+    def revoke_token(self, token: str):
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except InvalidTokenError:
+            return
+
+        self.token_cache.revoke(token, claims.get("exp", math.inf))
+
+    async def get_request_user(self, token: str = Depends(oauth2_scheme)):
+        try:
+            payload = self.decode_token(token)
             email: str = payload.get("sub")
 
             if email is None:
@@ -53,7 +183,9 @@ class AuthEmail:
     def get_request_user_with_roles(self, required_roles: list):
         user_model = self.user_model
 
-        def role_checker(current_user: user_model = Depends(self.get_request_user)):
+        async def role_checker(
+            current_user: user_model = Depends(self.get_request_user),
+        ):
             if current_user.role not in required_roles:
                 raise self.get_permissions_exc()
 
@@ -82,3 +214,57 @@ class AuthEmail:
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
+
+    async def run_hashing(self, func: Callable, *args):
+        """
+        Method that runs a password hashing call in `hash_executor`.
+
+        At most `hash_concurrency` calls are running or queued at once; a call
+        that cannot get a slot within `hash_wait` seconds is rejected, so a
+        login flood cannot build an unbounded backlog.
+
+        :return:
+            `Result of func.`
+        """
+        try:
+            async with asyncio.timeout(self.hash_wait):
+                await self.hash_semaphore.acquire()
+        except TimeoutError:
+            raise HTTPException(
+                503,
+                "Too many authentication attempts, try again later",
+                {"Retry-After": str(math.ceil(self.hash_wait))},
+            )
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.hash_executor, func, *args
+            )
+        finally:
+            self.hash_semaphore.release()
+
+    async def get_password_hash_async(self, password: str):
+        return await self.run_hashing(self.pwd_context.hash, password)
+
+    async def verify_password_async(self, plain_password, hashed_password):
+        return await self.run_hashing(
+            self.pwd_context.verify, plain_password, hashed_password
+        )
+
+    async def verify_and_update_password(
+        self, plain_password, hashed_password
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Method that checks a password on login and rehashes it when the stored
+        hash was made with a different `bcrypt_rounds`.
+
+        :param:
+        - `plain_password`: Password from the login request.
+        - `hashed_password`: Stored hash.
+
+        :return:
+            `Tuple of whether the password is valid and a new hash to store, or None.`
+        """
+        return await self.run_hashing(
+            self.pwd_context.verify_and_update, plain_password, hashed_password
+        )
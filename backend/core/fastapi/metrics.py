@@ -0,0 +1,147 @@
+import asyncio
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from core.metrics import http_request_duration, serialization_duration
+from core.sqlalchemy.query_stats import count_queries
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that records request latency per route template and status.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                perf_counter() - started,
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+            )
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that adds the number of database statements and their total
+    time to the response as `X-DB-Query-Count` and `X-DB-Query-Time` (ms).
+
+    Statements run after the response has started, e.g. while streaming the
+    body, are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with count_queries() as stats:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time", f"{stats.duration * 1000:.2f}".encode()),
+                    ]
+
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+endpoint_returned: ContextVar[Optional[list]] = ContextVar(
+    "endpoint_returned", default=None
+)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that times response model validation and serialization: from the
+    moment the endpoint returns to the built response. Endpoints returning a
+    `Response` themselves skip that step and are not observed.
+
+    Usage:
+        router = APIRouter(route_class=TimedRoute)
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, self.wrap_endpoint(endpoint), **kwargs)
+
+    @staticmethod
+    def wrap_endpoint(endpoint):
+        # `include_router` builds the route again from the wrapped endpoint
+        if getattr(endpoint, "is_timed", False):
+            return endpoint
+
+        def mark_returned(result):
+            returned = endpoint_returned.get()
+
+            if returned is not None and not isinstance(result, Response):
+                returned.append(perf_counter())
+
+            return result
+
+        # FastAPI reads the signature through `__wrapped__` and runs sync
+        # endpoints in a thread, so the wrapper keeps the endpoint's kind
+        if asyncio.iscoroutinefunction(endpoint):
+
+            @wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                return mark_returned(await endpoint(*args, **kwargs))
+
+        else:
+
+            @wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                return mark_returned(endpoint(*args, **kwargs))
+
+        wrapper.is_timed = True
+        return wrapper
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            # A list, so a sync endpoint's thread appends to the same object
+            returned = []
+            token = endpoint_returned.set(returned)
+
+            try:
+                response = await handler(request)
+            finally:
+                endpoint_returned.reset(token)
+
+            if returned:
+                serialization_duration.observe(perf_counter() - returned[0])
+
+            return response
+
+        return timed_handler
@@ -0,0 +1,32 @@
+from decimal import Decimal
+from typing import Any, Mapping
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Encodes plain data with orjson the way Pydantic would: Decimal as a
+    string and UTC datetimes with a "Z" suffix. Row mappings are accepted as is.
+    """
+    return orjson.dumps(content, default=default, option=orjson.OPT_UTC_Z)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response for endpoints that return rows directly, skipping the
+    `response_model` validation FastAPI applies to other return values.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
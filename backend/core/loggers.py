@@ -1,25 +1,169 @@
-import traceback
+import atexit
+import json
+import logging
+import sys
+import time
 from datetime import datetime
+from logging.handlers import QueueListener
+from queue import SimpleQueue
 
 import pytz
 
+from config.settings import LOG_LEVEL
 
 timezone = pytz.timezone("Europe/Moscow")
 
 
-def log_params(*args, separator):
-    stack = traceback.extract_stack()[:-2]
-    caller_frame = stack[-1]
-    caller_filename = caller_frame.filename
-    caller_lineno = caller_frame.lineno
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
 
-    _now = datetime.now(timezone).strftime("%H:%M %d.%m.%y")
+    Runs in the listener thread, so timestamps and JSON encoding stay off the
+    caller's path.
+    """
 
-    args_str = separator.join(str(arg) for arg in args)
-    location_str = f"[{_now}:{caller_filename}:{caller_lineno}]"
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
 
-    print(f"{args_str} {location_str}")
+        if record.pathname:
+            data["caller"] = f"{record.pathname}:{record.lineno}"
+
+        data.update(getattr(record, "fields", {}))
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+
+class RecordQueueListener(QueueListener):
+    """
+    Builds log records from the tuples queued by `StructuredLogger`.
+    """
+
+    def prepare(self, item: tuple) -> logging.LogRecord:
+        name, level, created, pathname, lineno, message, exc_info, fields = item
+
+        record = logging.LogRecord(
+            name, level, pathname, lineno, message, None, exc_info
+        )
+        record.created = created
+        record.fields = fields
+
+        return record
+
+
+class StructuredLogger:
+    """
+    Logger that queues plain tuples for a background thread to turn into
+    records, format and write.
+
+    Calls below `level` return after a single comparison, and the caller's
+    file and line are looked up only when `caller=True` is passed.
+
+    Usage:
+        logger.info("Flushed rows", rows=500, caller=True)
+    """
+
+    def __init__(self, name: str, level: int, queue: SimpleQueue):
+        self.name = name
+        self.level = level
+        self.queue = queue
+
+    def log(
+        self,
+        level: int,
+        message: str,
+        caller=False,
+        exc_info=False,
+        stacklevel=1,
+        **fields,
+    ):
+        if level < self.level:
+            return
+
+        pathname, lineno = "", 0
+
+        if caller:
+            frame = sys._getframe(stacklevel)
+            pathname, lineno = frame.f_code.co_filename, frame.f_lineno
+
+        self.queue.put(
+            (
+                self.name,
+                level,
+                time.time(),
+                pathname,
+                lineno,
+                message,
+                sys.exc_info() if exc_info else None,
+                fields,
+            )
+        )
+
+    def debug(self, message: str, **kwargs):
+        if logging.DEBUG >= self.level:
+            self.log(logging.DEBUG, message, stacklevel=2, **kwargs)
+
+    def info(self, message: str, **kwargs):
+        if logging.INFO >= self.level:
+            self.log(logging.INFO, message, stacklevel=2, **kwargs)
+
+    def warning(self, message: str, **kwargs):
+        if logging.WARNING >= self.level:
+            self.log(logging.WARNING, message, stacklevel=2, **kwargs)
+
+    def error(self, message: str, **kwargs):
+        if logging.ERROR >= self.level:
+            self.log(logging.ERROR, message, stacklevel=2, **kwargs)
+
+
+log_queue = SimpleQueue()
+
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(JsonFormatter())
+
+listener = RecordQueueListener(log_queue, stream_handler)
+listener.start()
+
+
+@atexit.register
+def stop_listener():
+    if listener._thread is not None:
+        listener.stop()
+
+
+def get_log_level(name: str) -> int:
+    """
+    Resolves a level name like "warning"; unknown names fail at import instead
+    of breaking every later level comparison.
+    """
+    level = logging.getLevelName(name.strip().upper())
+
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown LOG_LEVEL: {name!r}")
+
+    return level
+
+
+logger = StructuredLogger("app", get_log_level(LOG_LEVEL), log_queue)
+
+
+def log_params(*args, separator, stacklevel=2):
+    logger.log(
+        logging.INFO,
+        separator.join(str(arg) for arg in args),
+        caller=True,
+        stacklevel=stacklevel,
+    )
 
 
 def printl(*args, separator=", "):
-    log_params(*args, separator=separator)
+    log_params(*args, separator=separator, stacklevel=3)
@@ -0,0 +1,145 @@
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+
+class Histogram:
+    """
+    Prometheus histogram kept in plain dicts and lists.
+
+    `observe` is a bisect and three increments, cheap enough for hot paths.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self.series.get(labels)
+
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def time(self, *labels):
+        """
+        Decorator that observes the duration of an async function.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = perf_counter()
+
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.observe(perf_counter() - started, *labels)
+
+            return wrapper
+
+        return decorator
+
+    def get_labels(self, labels: tuple, **extra) -> str:
+        pairs = [*zip(self.labelnames, labels), *extra.items()]
+        if not pairs:
+            return ""
+
+        return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        for labels, (counts, total, count) in list(self.series.items()):
+            cumulative = 0
+
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                bucket_labels = self.get_labels(labels, le=bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+
+            lines.append(f"{self.name}_sum{self.get_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{self.get_labels(labels)} {count}")
+
+        return lines
+
+
+def render_gauges(prefix: str, values: dict, documentation: str) -> list:
+    lines = []
+
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        lines += [
+            f"# HELP {name} {documentation}",
+            f"# TYPE {name} gauge",
+            f"{name} {value}",
+        ]
+
+    return lines
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency.",
+    ("method", "route", "status"),
+)
+tron_request_duration = Histogram(
+    "tron_request_duration_seconds",
+    "TRON node call latency.",
+    ("operation",),
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Database execution time of Orm methods.",
+    ("method",),
+)
+serialization_duration = Histogram(
+    "response_serialization_duration_seconds",
+    "Response model validation and serialization time.",
+)
+
+histograms = [
+    http_request_duration,
+    tron_request_duration,
+    db_query_duration,
+    serialization_duration,
+]
+
+
+def render_metrics(*extra_lines) -> str:
+    lines = []
+
+    for histogram in histograms:
+        lines += histogram.render()
+
+    for extra in extra_lines:
+        lines += extra
+
+    return "\n".join(lines) + "\n"
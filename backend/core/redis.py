@@ -0,0 +1,143 @@
+import asyncio
+from urllib.parse import urlsplit
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisClient:
+    """
+    Minimal asyncio client speaking the Redis protocol (RESP2).
+
+    Covers what the cache needs: one command per round-trip over a pool of at
+    most `pool_size` connections, opened lazily and reused. Connecting and each
+    round-trip are bounded by `timeout` seconds; a command failing on a pooled
+    connection, which the server may have closed meanwhile, is retried once on
+    a fresh one.
+
+    Usage:
+        client = RedisClient("redis://localhost:6379/0")
+        await client.execute("SET", "key", b"value", "PX", 5000)
+    """
+
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 1):
+        parts = urlsplit(url)
+
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self.semaphore = asyncio.Semaphore(pool_size)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    @staticmethod
+    def encode_command(args: tuple) -> bytes:
+        chunks = [b"*%d\r\n" % len(args)]
+
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+
+            chunks.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+
+        return b"".join(chunks)
+
+    @classmethod
+    async def read_reply(cls, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+
+        prefix, body = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            return RedisError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+
+            return (await reader.readexactly(length + 2))[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+
+            return [await cls.read_reply(reader) for _ in range(length)]
+
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    async def send(self, connection: tuple, *args):
+        reader, writer = connection
+
+        writer.write(self.encode_command(args))
+        await writer.drain()
+
+        return await self.read_reply(reader)
+
+    async def connect(self):
+        async with asyncio.timeout(self.timeout):
+            connection = await asyncio.open_connection(self.host, self.port)
+
+        for args in (
+            ("AUTH", self.password) if self.password else None,
+            ("SELECT", self.db) if self.db else None,
+        ):
+            if args is None:
+                continue
+
+            reply = await self.round_trip(connection, *args)
+            if isinstance(reply, RedisError):
+                connection[1].close()
+                raise reply
+
+        return connection
+
+    async def round_trip(self, connection: tuple, *args):
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await self.send(connection, *args)
+        except BaseException:
+            connection[1].close()
+            raise
+
+    async def execute(self, *args):
+        """
+        Method that sends one command and returns its decoded reply.
+
+        :return:
+            `str for simple strings, int, bytes or None for bulk strings, list for arrays.`
+        """
+        async with self.semaphore:
+            connection = self.idle.pop() if self.idle else None
+
+            if connection is not None:
+                try:
+                    reply = await self.round_trip(connection, *args)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # Closed by the server while idle, likely with the other idle ones
+                    await self.close()
+                    connection = None
+
+            if connection is None:
+                connection = await self.connect()
+                reply = await self.round_trip(connection, *args)
+
+            self.idle.append(connection)
+
+        if isinstance(reply, RedisError):
+            raise reply
+
+        return reply
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
@@ -1,52 +1,128 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, Response
-from sqlalchemy import asc, desc, select
+from sqlalchemy import ARRAY, asc, bindparam, desc, func, or_, select, true, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from core.metrics import db_query_duration
 from core.sqlalchemy.orm import Orm
 
 
 class Crud:
-    def __init__(self, model):
+    def __init__(self, model, sortable_fields: Optional[list] = None):
         self.model = model
+        # Fields allowed as `sort_field`; each should lead an index on (field, id)
+        self.sortable_fields = sortable_fields
 
     def get_not_found_text(self, obj_id: int):
         return f"{self.model.__name__} with ID №{obj_id} not found"
 
+    @staticmethod
+    def encode_cursor(values: list) -> str:
+        return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, columns: list) -> list:
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+
+            if not isinstance(values, list) or len(values) != len(columns):
+                raise ValueError(cursor)
+
+            return [
+                (
+                    datetime.fromisoformat(value)
+                    if column.type.python_type is datetime
+                    else column.type.python_type(value)
+                )
+                for column, value in zip(columns, values)
+            ]
+
+        except (ValueError, TypeError, NotImplementedError):
+            raise HTTPException(400, "Invalid cursor")
+
+    def get_sort_columns(self, sort_field: Optional[str]):
+        if (
+            sort_field is not None
+            and self.sortable_fields is not None
+            and sort_field not in self.sortable_fields
+        ):
+            raise HTTPException(400, f"Sorting by {sort_field} is not supported")
+
+        sort_column = getattr(self.model, sort_field or "id", None)
+
+        if sort_column is None or sort_column is self.model.id:
+            return [self.model.id]
+
+        return [sort_column, self.model.id]
+
     @staticmethod
     def get_unique_fields(model):
         return [column.name for column in model.__table__.columns if column.unique]
 
     @staticmethod
-    async def check_field_unique(
-        model, data: dict, field: str, session: AsyncSession, obj_id=None
-    ):
-        async with session.begin():
-            field_value = data.get(field)
-            filter_data = {field: field_value}
-            exclude_data = {"id": obj_id} if obj_id else None
+    def get_unique_query(model, values: dict, obj_id=None):
+        """
+        Method that builds a query for the records holding any of `values`.
 
-            query = await Orm.filter_by(model, filter_data, session, exclude_data)
+        Each condition is served by its column's unique index and the matches
+        are OR-ed, so all unique fields are checked in a single statement.
 
-            if query.scalar() is not None:
-                raise HTTPException(
-                    400, f"{model.__name__} with {field}={field_value} already exists"
-                )
+        :param:
+        - `model`: SQLAlchemy model.
+        - `values`: Dictionary of unique fields and their new values.
+        - `obj_id`: ID of the record being updated, left out of the check.
+
+        :return:
+            `Select of the unique fields, at most one record per field.`
+        """
+        query = select(*(getattr(model, field) for field in values)).where(
+            or_(*(getattr(model, field) == value for field, value in values.items()))
+        )
+
+        if obj_id:
+            query = query.where(Orm.get_exclude_condition(model, {"id": obj_id}))
+
+        return query.limit(len(values))
 
     @classmethod
     async def check_unique_fields(
         cls, model, data: dict, session: AsyncSession, obj_id=None
     ):
-        unique_fields = cls.get_unique_fields(model)
+        # NULLs never conflict in a unique index, so they are not checked
+        values = {
+            field: data[field]
+            for field in cls.get_unique_fields(model)
+            if data.get(field) is not None
+        }
+
+        if not values:
+            return
+
+        async with session.begin():
+            execution = await session.execute(
+                cls.get_unique_query(model, values, obj_id)
+            )
+            rows = execution.mappings().all()
 
-        for field in unique_fields:
-            await cls.check_field_unique(model, data, field, session, obj_id)
+        for field, value in values.items():
+            if any(row[field] == value for row in rows):
+                raise HTTPException(
+                    400, f"{model.__name__} with {field}={value} already exists"
+                )
 
     async def create(self, data, session: AsyncSession, relations=None):
         """
         Method that creates a new instance of the model
 
+        Unique constraints are enforced by the database, a violation is raised
+        as `IntegrityError` and handled by `related_errors_handler`.
+
         :param:
         - `data`: Dictionary with data to create a new record.
         - `session`: The current database session.
@@ -56,9 +132,7 @@ class Crud:
         """
         model_dump = data if isinstance(data, dict) else data.model_dump()
 
-        await self.check_unique_fields(self.model, model_dump, session)
-
-        instance = await Orm.create(self.model, model_dump, session)
+        instance = await Orm.create_returning(self.model, model_dump, session)
 
         if relations:
             instance = await Orm.scalar(
@@ -73,7 +147,7 @@ class Crud:
         data_list = data.model_dump()[bulk_key]
 
         result = await Orm.insert(self.model, data_list, session, return_data)
-        return {bulk_key: [{"id": row[0]} for row in result.fetchall()]}
+        return {bulk_key: [dict(row._mapping) for row in result.fetchall()]}
 
     async def delete(
         self,
@@ -102,6 +176,46 @@ class Crud:
 
         return Response(content=content, status_code=status)
 
+    def get_list_query(
+        self,
+        relations=None,
+        sort_field: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        filters: list = None,
+        after: Optional[str] = None,
+        as_rows: bool = False,
+        **sql_methods,
+    ):
+        if as_rows:
+            query = select(*self.model.__table__.columns)
+        else:
+            query = select(self.model)
+
+        if filters:
+            query = query.filter(*filters)
+
+        if sort_field or sort_order or after:
+            sort_columns = self.get_sort_columns(sort_field)
+            is_asc = (sort_order or "asc").lower() == "asc"
+            order = asc if is_asc else desc
+
+            query = query.order_by(*(order(column) for column in sort_columns))
+
+            if after:
+                values = self.decode_cursor(after, sort_columns)
+                key, bound = tuple_(*sort_columns), tuple_(*values)
+
+                query = query.where(key > bound if is_asc else key < bound)
+
+        if relations and not as_rows:
+            query = Orm.get_query_with_relations(query, relations)
+
+        for method, value in sql_methods.items():
+            query = getattr(query, method)(value)
+
+        return query
+
+    @db_query_duration.time("list")
     async def list(
         self,
         session: AsyncSession,
@@ -109,46 +223,281 @@ class Crud:
         sort_field: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         filters: list = None,
-        **sql_methods
+        after: Optional[str] = None,
+        as_rows: bool = False,
+        **sql_methods,
     ):
         """
         Метод для получения списка объектов с фильтрацией и сортировкой.
 
+        Запрос строится в `get_list_query`, поэтому его план можно проверить
+        через EXPLAIN без выполнения.
+
         :param session: Текущая сессия базы данных.
         :param relations: Связанные поля.
-        :param sort_field: Поле для сортировки.
+        :param sort_field: Поле для сортировки (из `sortable_fields`, если задан).
         :param sort_order: Порядок сортировки ('asc' или 'desc').
         :param filters: Произвольные параметры для фильтрации.
+        :param after: Курсор, после которого начинается выборка (см. `paginate`).
+        :param as_rows: Вернуть строки-словари столбцов таблицы вместо ORM-объектов
+            (без identity map и без загрузки связей).
 
         :return: Список объектов с примененными фильтрацией и сортировкой.
         """
+        query = self.get_list_query(
+            relations, sort_field, sort_order, filters, after, as_rows, **sql_methods
+        )
+        execution = await session.execute(query)
+
+        if as_rows:
+            return execution.mappings().all()
+
+        return execution.scalars().all()
+
+    def get_aggregate_columns(self, value_column):
+        return [
+            func.count().label("count"),
+            func.min(value_column).label("min"),
+            func.max(value_column).label("max"),
+            func.avg(value_column).label("avg"),
+            func.sum(value_column).label("sum"),
+        ]
+
+    @db_query_duration.time("aggregate")
+    async def aggregate(
+        self,
+        session: AsyncSession,
+        value_field: str,
+        group_field: Optional[str] = None,
+        filters: list = None,
+    ):
+        """
+        Method that computes count, min, max, avg and sum of a field in the database
 
-        query = select(self.model)
+        :param:
+        - `session`: The current database session.
+        - `value_field`: Field to aggregate.
+        - `group_field`: Field to group by; the whole table is one group when omitted.
+        - `filters`: SQLAlchemy filter expressions.
+
+        :return:
+            `Mappings with the aggregates, and the group value under group_field.`
+        """
+        value_column = getattr(self.model, value_field)
+        columns = self.get_aggregate_columns(value_column)
+
+        if group_field is not None:
+            group_column = getattr(self.model, group_field)
+            columns.insert(0, group_column)
+
+        query = select(*columns)
 
         if filters:
             query = query.filter(*filters)
 
-        if sort_field or sort_order:
-            sort_field = sort_field or "id"
-            sort_column = getattr(self.model, sort_field, None)
+        if group_field is not None:
+            query = query.group_by(group_column).order_by(group_column)
 
-            if sort_column:
-                order = (
-                    asc(sort_column)
-                    if sort_order.lower() == "asc"
-                    else desc(sort_column)
-                )
-                query = query.order_by(order)
+        execution = await session.execute(query)
+        return execution.mappings().all()
 
-        if relations:
-            query = Orm.get_query_with_relations(query, relations)
+    @db_query_duration.time("aggregate_latest")
+    async def aggregate_latest(
+        self,
+        session: AsyncSession,
+        field: str,
+        value_field: str,
+        filters: list = None,
+    ):
+        """
+        Method that aggregates a field over the newest object of each field value
 
-        for method, value in sql_methods.items():
-            query = getattr(query, method)(value)
+        The newest objects are picked with `DISTINCT ON (field) ... ORDER BY
+        field, id DESC`, which walks an index on `(field, id DESC)`.
+
+        :param:
+        - `session`: The current database session.
+        - `field`: Name of the grouping field.
+        - `value_field`: Field to aggregate.
+        - `filters`: SQLAlchemy filter expressions applied before picking.
+
+        :return:
+            `Mapping with count, min, max, avg and sum.`
+        """
+        field_column = getattr(self.model, field)
+        value_column = getattr(self.model, value_field)
+
+        newest = select(value_column).distinct(field_column)
+
+        if filters:
+            newest = newest.filter(*filters)
+
+        newest = newest.order_by(field_column, self.model.id.desc()).subquery()
+
+        query = select(*self.get_aggregate_columns(newest.c[value_field]))
+
+        execution = await session.execute(query)
+        return execution.mappings().one()
+
+    @db_query_duration.time("downsample")
+    async def downsample(
+        self,
+        session: AsyncSession,
+        time_field: str,
+        value_field: str,
+        bucket_seconds: int,
+        filters: list = None,
+    ):
+        """
+        Method that aggregates a value into fixed time buckets in the database
+
+        :param:
+        - `session`: The current database session.
+        - `time_field`: Timestamp field the buckets are built on.
+        - `value_field`: Field to aggregate.
+        - `bucket_seconds`: Bucket width in seconds.
+        - `filters`: SQLAlchemy filter expressions.
+
+        :return:
+            `Mappings with bucket start, min, max and last value and row count.`
+        """
+        time_column = getattr(self.model, time_field)
+        value_column = getattr(self.model, value_field)
+
+        bucket = func.to_timestamp(
+            func.floor(func.extract("epoch", time_column) / bucket_seconds)
+            * bucket_seconds
+        ).label("bucket")
+        last_value = func.array_agg(
+            aggregate_order_by(value_column, time_column.desc(), self.model.id.desc()),
+            type_=ARRAY(value_column.type),
+        )[1]
+
+        query = select(
+            bucket,
+            func.min(value_column).label("min"),
+            func.max(value_column).label("max"),
+            last_value.label("last"),
+            func.count().label("count"),
+        )
+
+        if filters:
+            query = query.filter(*filters)
+
+        query = query.group_by(bucket).order_by(bucket)
 
         execution = await session.execute(query)
+        return execution.mappings().all()
+
+    def get_latest_query(self, field: str, field_values: list):
+        field_column = getattr(self.model, field)
+        keys = (
+            func.unnest(
+                bindparam("field_values", field_values, ARRAY(field_column.type))
+            )
+            .table_valued(field, with_ordinality="position")
+            .render_derived()
+        )
+
+        newest = (
+            select(self.model)
+            .where(field_column == keys.c[field])
+            .order_by(self.model.id.desc())
+            .limit(1)
+            .lateral()
+        )
+
+        return (
+            select(aliased(self.model, newest))
+            .select_from(keys)
+            .join(newest, true())
+            .order_by(keys.c.position)
+        )
+
+    async def latest(self, session: AsyncSession, field: str, field_values: list):
+        """
+        Method that retrieves the newest object (highest id) for each field value
+
+        Values are passed as one array parameter, and each is looked up with its
+        own `ORDER BY id DESC LIMIT 1` probe through a LATERAL join, which an
+        index on `(field, id DESC)` answers without scanning older rows.
+
+        :param:
+        - `session`: The current database session.
+        - `field`: Name of the grouping field.
+        - `field_values`: Values to find the newest objects for.
+
+        :return:
+            `List of objects in the order of field_values; missing values are skipped.`
+        """
+        execution = await session.execute(self.get_latest_query(field, field_values))
         return execution.scalars().all()
 
+    async def paginate(
+        self,
+        session: AsyncSession,
+        limit: int,
+        after: Optional[str] = None,
+        sort_field: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        filters: list = None,
+        relations=None,
+        as_rows: bool = False,
+    ):
+        """
+        Method that returns one page of objects using keyset pagination
+
+        Rows are ordered by `sort_field` and `id`, so the page is found through
+        the index instead of scanning and skipping `OFFSET` rows.
+
+        :param:
+        - `session`: The current database session.
+        - `limit`: Maximum number of objects on the page.
+        - `after`: Opaque cursor returned with the previous page.
+        - `as_rows`: Return column mappings instead of ORM objects (see `list`).
+
+        :return:
+            `Tuple of objects and the cursor of the next page (None on the last page).`
+        """
+        items = await self.list(
+            session,
+            relations,
+            sort_field,
+            sort_order,
+            filters,
+            after=after,
+            as_rows=as_rows,
+            limit=limit + 1,
+        )
+
+        if len(items) <= limit:
+            return items, None
+
+        items = items[:limit]
+        sort_columns = self.get_sort_columns(sort_field)
+
+        if as_rows:
+            values = [items[-1][column.key] for column in sort_columns]
+        else:
+            values = [getattr(items[-1], column.key) for column in sort_columns]
+
+        return items, self.encode_cursor(values)
+
+    async def last(self, session: AsyncSession):
+        """
+        Method that retrieves the newest object (highest id) through the primary key
+
+        :param:
+        - `session`: The current database session.
+
+        :return:
+            `Object instance or None if the table is empty.`
+        """
+        query = select(self.model).order_by(self.model.id.desc()).limit(1)
+
+        execution = await session.execute(query)
+        return execution.scalars().first()
+
     async def retrieve(self, obj_id: int, session: AsyncSession, relations=None):
         """
         Method that retrieves an instance of the model by ID
@@ -166,6 +515,37 @@ class Crud:
 
         return obj
 
+    async def stream(
+        self,
+        session: AsyncSession,
+        filters: list = None,
+        chunk_size: int = 1000,
+    ):
+        """
+        Method that streams table rows through a server-side cursor
+
+        Rows are fetched `chunk_size` at a time as plain tuples in table column
+        order, without ORM objects, so memory use does not depend on the table size.
+
+        :param:
+        - `session`: The current database session.
+        - `filters`: SQLAlchemy filter expressions.
+        - `chunk_size`: Number of rows fetched per round-trip.
+
+        :return:
+            `Async iterator of row lists ordered by id.`
+        """
+        query = select(*self.model.__table__.columns)
+
+        if filters:
+            query = query.filter(*filters)
+
+        query = query.order_by(self.model.id).execution_options(yield_per=chunk_size)
+        result = await session.stream(query)
+
+        async for rows in result.partitions():
+            yield rows
+
     async def update(
         self, data: dict, obj_id: int, session: AsyncSession, relations=None
     ):
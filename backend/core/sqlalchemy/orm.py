@@ -1,9 +1,11 @@
 from typing import Union, Any, Sequence
 
-from sqlalchemy import select, Result, Row, RowMapping, insert, update
+from sqlalchemy import select, Result, Row, RowMapping, and_, insert, not_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from core.metrics import db_query_duration
+
 
 class Orm:
 
@@ -12,6 +14,7 @@ class Orm:
         return query.options(selectinload(relations))
 
     @classmethod
+    @db_query_duration.time("all")
     async def all(
         cls, model, session: AsyncSession, relations=None
     ) -> Sequence[Row[Any] | RowMapping | Any]:
@@ -37,6 +40,7 @@ class Orm:
         return execution.scalars().all()
 
     @classmethod
+    @db_query_duration.time("create")
     async def create(cls, model, data: dict, session: AsyncSession):
         """
         Method to create the instance in the model based on a dictionary of fields.
@@ -59,6 +63,51 @@ class Orm:
         return instance
 
     @classmethod
+    @db_query_duration.time("create_returning")
+    async def create_returning(cls, model, data: dict, session: AsyncSession):
+        """
+        Method to create the instance with a single INSERT ... RETURNING statement.
+
+        Unlike `create`, the row is not re-selected after commit and database
+        constraint violations are raised as `IntegrityError`.
+
+        :param:
+        - `model`: SQLAlchemy model.
+        - `data`: Dictionary with model data.
+        - `session`: SQLAlchemy asynchronous session.
+
+        :return:
+            `Created object, detached from the session.`
+        """
+
+        stmt = insert(model).values(**data).returning(*model.__table__.columns)
+
+        result = await session.execute(stmt)
+        row = result.one()
+        await session.commit()
+
+        return model(**row._mapping)
+
+    @staticmethod
+    def get_exclude_condition(table, exclude_data: dict):
+        """
+        Method that builds `NOT (field IS NOT DISTINCT FROM value AND ...)`.
+
+        Like `EXCEPT`, it drops the rows matching all of `exclude_data` with NULLs
+        compared as equal, but as a plain predicate it is applied while scanning
+        instead of hashing two full result sets.
+        """
+        return not_(
+            and_(
+                *(
+                    getattr(table, field).is_not_distinct_from(value)
+                    for field, value in exclude_data.items()
+                )
+            )
+        )
+
+    @classmethod
+    @db_query_duration.time("filter_by")
     async def filter_by(
         cls,
         table,
@@ -66,6 +115,7 @@ class Orm:
         session: AsyncSession,
         exclude_data: dict = None,
         relations=None,
+        execute=True,
     ) -> Result:
         """
         Method to filter records in the model based on a dictionary of fields.
@@ -74,24 +124,28 @@ class Orm:
         - `table`: SQLAlchemy model.
         - `filter_data`: Dictionary with filter conditions.
         - `session`: SQLAlchemy asynchronous session.
+        - `exclude_data`: Dictionary of fields whose matching records are left out.
         - `relations`: related fields.
 
         :return:
             `Query result filtered by the dictionary fields.`
         """
 
-        query = select(table)
+        query = select(table).filter_by(**filter_data)
 
         if relations:
             query = cls.get_query_with_relations(query, relations)
 
         if exclude_data:
-            exclude_query = select(table).filter_by(**exclude_data)
-            query = query.except_(exclude_query)
+            query = query.where(cls.get_exclude_condition(table, exclude_data))
 
-        return await session.execute(query.filter_by(**filter_data))
+        if execute:
+            return await session.execute(query)
+        else:
+            return query
 
     @classmethod
+    @db_query_duration.time("insert")
     async def insert(cls, model, data: list, session: AsyncSession, return_data=None):
         """
         Method to insert data in the model based on a dictionary of fields.
@@ -100,22 +154,27 @@ class Orm:
         - `model`: SQLAlchemy model.
         - `data`: Dictionary with model data.
         - `session`: SQLAlchemy asynchronous session.
-        - `return_data`: Fields to return after insert.
+        - `return_data`: Field or list of fields to return after insert.
 
         :return:
-            `ids of inserted objects.`
+            `Returned fields of inserted objects (ids by default), in the order of data.`
         """
-        if not return_data:
-            return_data = model.id
+        if return_data is None:
+            return_data = [model.id]
+        elif not isinstance(return_data, (list, tuple)):
+            return_data = [return_data]
 
-        stmt = insert(model).values(data).returning(return_data)
+        # RETURNING of a multi-row VALUES has no guaranteed order, so rows are
+        # sent as executemany and SQLAlchemy sorts them back by parameter order
+        stmt = insert(model).returning(*return_data, sort_by_parameter_order=True)
 
-        result = await session.execute(stmt)
+        result = await session.execute(stmt, data)
         await session.commit()
 
         return result
 
     @classmethod
+    @db_query_duration.time("scalar")
     async def scalar(
         cls,
         table,
@@ -137,13 +196,14 @@ class Orm:
         """
 
         if isinstance(filters, dict):
-            query = await cls.filter_by(table, filters, session, relations)
+            query = await cls.filter_by(table, filters, session, relations=relations)
         else:
             query = await cls.where(table, filters, session, relations)
 
         return query.scalar()
 
     @staticmethod
+    @db_query_duration.time("update")
     async def update(obj, data: dict, session: AsyncSession):
         for key, value in data.items():
             setattr(obj, key, value)
@@ -151,6 +211,7 @@ class Orm:
         await session.commit()
 
     @staticmethod
+    @db_query_duration.time("update_field")
     async def update_field(
         model, update_fields: dict, session: AsyncSession, filter_expr=None
     ):
@@ -162,6 +223,7 @@ class Orm:
         await session.commit()
 
     @classmethod
+    @db_query_duration.time("where")
     async def where(
         cls, model, filter_expr, session: AsyncSession, relations=None, execute=True
     ) -> Result:
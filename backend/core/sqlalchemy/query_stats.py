@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.loggers import logger
+
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+
+class QueryStats:
+    """
+    Statements executed and total database time within one unit of work,
+    usually an HTTP request. Statements are also added to `parent`, so nested
+    counters do not hide them from outer ones.
+    """
+
+    def __init__(self, parent: "QueryStats" = None):
+        self.parent = parent
+
+        self.count = 0
+        self.duration = 0.0
+        self.statements: list[str] = []
+
+    def add(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements.append(statement)
+
+        if self.parent is not None:
+            self.parent.add(statement, duration)
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def count_queries():
+    """
+    Counts statements executed in the current context, including ones run by
+    `AsyncSession` methods awaited inside the block.
+
+    Usage:
+        with count_queries() as stats:
+            await client.get("/queries/")
+        print(stats.count, stats.duration)
+    """
+    stats = QueryStats(query_stats.get())
+    token = query_stats.set(stats)
+
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Fails when the block executes more than `limit` statements.
+    """
+    with count_queries() as stats:
+        yield stats
+
+    statements = "\n".join(stats.statements)
+    assert (
+        stats.count <= limit
+    ), f"{stats.count} queries executed, expected at most {limit}:\n{statements}"
+
+
+def explain(connection, statement: str, parameters) -> str:
+    cursor = connection.connection.dbapi_connection.cursor()
+
+    try:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: AsyncEngine, slow_query_threshold: float):
+    """
+    Times every statement of `engine`, adds it to the current `QueryStats` and
+    logs statements slower than `slow_query_threshold` seconds with their plan.
+
+    The plan comes from a plain EXPLAIN on the same connection, so the slow
+    statement is not executed again; a threshold of 0 or less disables it.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        # Statements on one connection never overlap, so one slot is enough
+        connection.info["query_started"] = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        duration = perf_counter() - connection.info["query_started"]
+
+        stats = query_stats.get()
+        if stats is not None:
+            stats.add(statement, duration)
+
+        if slow_query_threshold <= 0 or duration < slow_query_threshold:
+            return
+
+        plan = None
+        if not executemany and statement.lstrip().lower().startswith(EXPLAINABLE):
+            try:
+                plan = explain(connection, statement, parameters)
+            except Exception as exc:
+                plan = f"EXPLAIN failed: {exc!r}"
+
+        logger.warning(
+            "Slow query",
+            duration_ms=round(duration * 1000, 2),
+            statement=statement,
+            plan=plan,
+        )
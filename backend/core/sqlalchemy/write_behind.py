@@ -0,0 +1,149 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from core.loggers import logger
+from core.sqlalchemy.orm import Orm
+
+STOP = object()
+
+
+class WriteBehindBuffer:
+    """
+    Queues rows in memory and inserts them in batches with `Orm.insert`.
+
+    A batch is flushed when `max_rows` rows are queued or `flush_interval`
+    seconds after its first row, whichever comes first. `put` waits while
+    `max_size` rows are pending, and `stop` flushes everything still queued.
+    `on_flush` is awaited with every inserted batch.
+
+    A failed batch is retried with exponential backoff from `retry_delay` up to
+    `max_retry_delay` seconds and stays counted as pending meanwhile, so a
+    database outage blocks `put` instead of losing rows. Once `stop` is called,
+    a batch that fails again is logged and dropped so shutdown can finish.
+    """
+
+    def __init__(
+        self,
+        model,
+        session_factory,
+        max_rows: int = 500,
+        flush_interval: float = 0.2,
+        max_size: int = 10000,
+        on_flush: Callable[[list], Awaitable] = None,
+        retry_delay: float = 0.1,
+        max_retry_delay: float = 5,
+    ):
+        self.model = model
+        self.session_factory = session_factory
+
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self.queue = asyncio.Queue(max_size)
+        # Released only after a row is inserted, so rows being retried still count
+        self.pending = asyncio.Semaphore(max_size)
+        self.stopping = False
+        self.task = None
+
+    async def start(self):
+        self.stopping = False
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+
+        self.stopping = True
+
+        await self.queue.put(STOP)
+        await self.task
+
+        self.task = None
+
+    async def put(self, row: dict):
+        if self.task is None:
+            raise RuntimeError(f"{self.model.__name__} write-behind buffer is stopped")
+
+        await self.pending.acquire()
+
+        try:
+            await self.queue.put(row)
+        except BaseException:
+            self.pending.release()
+            raise
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            row = await self.queue.get()
+            if row is STOP:
+                return
+
+            rows = [row]
+            deadline = loop.time() + self.flush_interval
+
+            while len(rows) < self.max_rows:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        row = await self.queue.get()
+                except TimeoutError:
+                    break
+
+                if row is STOP:
+                    await self.flush(rows)
+                    return
+
+                rows.append(row)
+
+            await self.flush(rows)
+
+    async def flush(self, rows: list):
+        delay = self.retry_delay
+
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    await Orm.insert(self.model, rows, session)
+                break
+
+            except Exception:
+                if self.stopping:
+                    logger.error(
+                        "Write-behind flush failed, dropping rows on shutdown",
+                        exc_info=True,
+                        model=self.model.__name__,
+                        rows=len(rows),
+                    )
+                    self.release(rows)
+                    return
+
+                logger.warning(
+                    "Write-behind flush failed, retrying",
+                    exc_info=True,
+                    model=self.model.__name__,
+                    rows=len(rows),
+                    delay=delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+        self.release(rows)
+
+        if self.on_flush is not None:
+            try:
+                await self.on_flush(rows)
+            except Exception:
+                logger.error(
+                    "Write-behind flush callback failed",
+                    exc_info=True,
+                    model=self.model.__name__,
+                    rows=len(rows),
+                )
+
+    def release(self, rows: list):
+        for _ in rows:
+            self.pending.release()
@@ -1,14 +1,76 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from sqlalchemy.exc import IntegrityError, DBAPIError
 
+from config import database_conf
+from config.settings import (
+    DEBUG,
+    QUERIES_BUFFER_SIZE,
+    QUERIES_FLUSH_INTERVAL_MS,
+    QUERIES_FLUSH_ROWS,
+    QUERIES_WRITE_BEHIND,
+    WATCH_BATCH_SIZE,
+    WATCH_CONCURRENCY,
+    WATCH_ENABLED,
+    WATCH_INTERVAL,
+    WATCH_JITTER,
+)
+from core.cache import close_shared_backend
+from core.fastapi.metrics import MetricsMiddleware, QueryStatsMiddleware
+from core.sqlalchemy.write_behind import WriteBehindBuffer
 from exc_handlers.base import (
     value_error_handler,
     related_errors_handler,
     input_error_handler,
 )
-from views import query_router
+from services.queries import invalidate_queries
+from services.tron import create_tron_client
+from services.watcher import WatchScheduler
+from tables.address_query import AddressQuery
+from views import metrics_router, query_router, stats_router, watched_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.tron = create_tron_client()
+
+    if QUERIES_WRITE_BEHIND:
+        app.state.query_buffer = WriteBehindBuffer(
+            AddressQuery,
+            database_conf.SessionLocal,
+            QUERIES_FLUSH_ROWS,
+            QUERIES_FLUSH_INTERVAL_MS / 1000,
+            QUERIES_BUFFER_SIZE,
+            invalidate_queries,
+        )
+        await app.state.query_buffer.start()
+
+    if WATCH_ENABLED:
+        app.state.watcher = WatchScheduler(
+            database_conf.engine,
+            database_conf.SessionLocal,
+            app.state.tron,
+            WATCH_INTERVAL,
+            WATCH_CONCURRENCY,
+            WATCH_JITTER,
+            WATCH_BATCH_SIZE,
+        )
+        await app.state.watcher.start()
+
+    yield
 
-app = FastAPI(title="Test tron app")
+    if WATCH_ENABLED:
+        await app.state.watcher.stop()
+
+    if QUERIES_WRITE_BEHIND:
+        await app.state.query_buffer.stop()
+
+    await app.state.tron.close()
+    await close_shared_backend()
+
+
+app = FastAPI(title="Test tron app", lifespan=lifespan)
 
 exc_handlers = {
     DBAPIError: input_error_handler,
@@ -16,7 +78,10 @@ exc_handlers = {
     ValueError: value_error_handler,
 }
 routers = {
-    "/queries": query_router
+    "/queries": query_router,
+    "/watched": watched_router,
+    "/stats": stats_router,
+    "": metrics_router,
 }
 
 for exception, handler in exc_handlers.items():
@@ -24,3 +89,8 @@ for exception, handler in exc_handlers.items():
 
 for prefix, router in routers.items():
     app.include_router(router, prefix=prefix)
+
+app.add_middleware(MetricsMiddleware)
+
+if DEBUG:
+    app.add_middleware(QueryStatsMiddleware)
@@ -10,6 +10,8 @@ from alembic import context
 from config.database_conf import Base
 from config.settings import DATABASE_URL
 from tables.address_query import AddressQuery
+from tables.watched_address import WatchedAddress
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -0,0 +1,56 @@
+"""address id index
+
+Revision ID: 57ef9d8482ea
+Revises: c15c85247801
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "57ef9d8482ea"
+down_revision: Union[str, None] = "c15c85247801"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_address_queries_address_id",
+            "address_queries",
+            ["address", sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_address_queries_address"),
+            table_name="address_queries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_address_queries_address"),
+            "address_queries",
+            ["address"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_address_queries_address_id",
+            table_name="address_queries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,92 @@
+"""balance in sun
+
+Revision ID: acae54f5c342
+Revises: e11e70e99a8d
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "acae54f5c342"
+down_revision: Union[str, None] = "e11e70e99a8d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONVERT_CHUNK_SIZE = 10000
+
+
+TO_SUN = (
+    "UPDATE address_queries "
+    "SET balance = round(coalesce(trx_balance, 0) * 1000000)::bigint"
+)
+
+
+def convert_in_chunks(statement: str) -> int:
+    # Short id-range updates keep row locks brief on a live table
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(
+            sa.text("SELECT coalesce(max(id), 0) FROM address_queries")
+        ).scalar()
+
+        for start in range(0, max_id, CONVERT_CHUNK_SIZE):
+            connection.execute(
+                sa.text(f"{statement} WHERE id > :start AND id <= :end"),
+                {"start": start, "end": start + CONVERT_CHUNK_SIZE},
+            )
+
+    return max_id
+
+
+def upgrade() -> None:
+    op.add_column(
+        "address_queries", sa.Column("balance", sa.BigInteger(), nullable=True)
+    )
+    max_id = convert_in_chunks(TO_SUN)
+
+    # Rows the old code inserted during the conversion still lack balance.
+    # Writes wait on the lock until trx_balance is gone, so none are missed.
+    op.execute("LOCK TABLE address_queries IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(sa.text(f"{TO_SUN} WHERE id > :max_id").bindparams(max_id=max_id))
+    op.drop_column("address_queries", "trx_balance")
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+
+        # A validated CHECK lets SET NOT NULL skip its full-table scan
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries ADD CONSTRAINT "
+                "address_queries_balance_not_null "
+                "CHECK (balance IS NOT NULL) NOT VALID"
+            )
+        )
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries VALIDATE CONSTRAINT "
+                "address_queries_balance_not_null"
+            )
+        )
+        connection.execute(
+            sa.text("ALTER TABLE address_queries ALTER COLUMN balance SET NOT NULL")
+        )
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries DROP CONSTRAINT "
+                "address_queries_balance_not_null"
+            )
+        )
+
+
+def downgrade() -> None:
+    op.add_column(
+        "address_queries", sa.Column("trx_balance", sa.Float(), nullable=True)
+    )
+    convert_in_chunks("UPDATE address_queries SET trx_balance = balance / 1000000.0")
+    op.drop_column("address_queries", "balance")
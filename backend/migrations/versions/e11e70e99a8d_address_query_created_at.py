@@ -0,0 +1,107 @@
+"""address query created_at
+
+Revision ID: e11e70e99a8d
+Revises: 57ef9d8482ea
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e11e70e99a8d"
+down_revision: Union[str, None] = "57ef9d8482ea"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def upgrade() -> None:
+    # Nullable with a default: no table rewrite, new rows get their time
+    op.add_column(
+        "address_queries",
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.alter_column("address_queries", "created_at", server_default=sa.func.now())
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(
+            sa.text("SELECT coalesce(max(id), 0) FROM address_queries")
+        ).scalar()
+
+        # Historical request times are unknown, so old rows get the migration time.
+        # Short id-range updates keep row locks brief on a live table.
+        for start in range(0, max_id, BACKFILL_CHUNK_SIZE):
+            connection.execute(
+                sa.text(
+                    "UPDATE address_queries SET created_at = now() "
+                    "WHERE id > :start AND id <= :end AND created_at IS NULL"
+                ),
+                {"start": start, "end": start + BACKFILL_CHUNK_SIZE},
+            )
+
+        # A validated CHECK lets SET NOT NULL skip its full-table scan
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries ADD CONSTRAINT "
+                "address_queries_created_at_not_null "
+                "CHECK (created_at IS NOT NULL) NOT VALID"
+            )
+        )
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries VALIDATE CONSTRAINT "
+                "address_queries_created_at_not_null"
+            )
+        )
+        connection.execute(
+            sa.text("ALTER TABLE address_queries ALTER COLUMN created_at SET NOT NULL")
+        )
+        connection.execute(
+            sa.text(
+                "ALTER TABLE address_queries DROP CONSTRAINT "
+                "address_queries_created_at_not_null"
+            )
+        )
+
+        op.create_index(
+            "ix_address_queries_address_created_at",
+            "address_queries",
+            ["address", "created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_address_queries_created_at_brin",
+            "address_queries",
+            ["created_at"],
+            unique=False,
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_address_queries_created_at_brin",
+            table_name="address_queries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_address_queries_address_created_at",
+            table_name="address_queries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_column("address_queries", "created_at")
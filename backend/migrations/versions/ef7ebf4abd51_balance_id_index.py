@@ -0,0 +1,41 @@
+"""balance id index
+
+Revision ID: ef7ebf4abd51
+Revises: acae54f5c342
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ef7ebf4abd51"
+down_revision: Union[str, None] = "acae54f5c342"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_address_queries_balance_id",
+            "address_queries",
+            ["balance", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_address_queries_balance_id",
+            table_name="address_queries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
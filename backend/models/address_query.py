@@ -1,11 +1,97 @@
-from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+from config.settings import TRON_BATCH_MAX_SIZE
+
+SUN_PER_TRX = 1_000_000
+
+
+def sun_to_trx(balance: int) -> Decimal:
+    return Decimal(balance) / SUN_PER_TRX
+
+
+def get_query_row(row) -> dict:
+    """
+    Builds the `QueryModel` JSON fields from an `address_queries` row mapping,
+    for responses serialized without the model.
+    """
+    return {**row, "trx_balance": sun_to_trx(row["balance"])}
 
 
 class QueryModel(BaseModel):
     id: int
 
     address: str
-    trx_balance: float
+    balance: int
+
+    bandwidth: int
+    energy: int
+
+    created_at: datetime
+
+    @computed_field
+    @property
+    def trx_balance(self) -> Decimal:
+        return sun_to_trx(self.balance)
+
+
+class QueryResultModel(QueryModel):
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    cached: bool = False
+    cache_age: float = 0
+
+
+class QueryPageModel(BaseModel):
+    items: List[QueryModel]
+    next_cursor: Optional[str] = None
+
+
+class QueryBucketModel(BaseModel):
+    bucket: datetime
+
+    min: int
+    max: int
+    last: int
+
+    count: int
+
+
+class QueryAggregateModel(BaseModel):
+    count: int
+
+    min: Optional[int] = None
+    max: Optional[int] = None
+    avg: Optional[float] = None
+    sum: Optional[int] = None
+
+
+class QueryAddressAggregateModel(QueryAggregateModel):
+    address: str
+
+
+class QueryCreateModel(BaseModel):
+    address: str
+    balance: int
 
     bandwidth: int
     energy: int
+
+
+class QueryBulkCreateModel(BaseModel):
+    queries: List[QueryCreateModel]
+
+
+class BatchQueryModel(BaseModel):
+    addresses: List[str] = Field(min_length=1, max_length=TRON_BATCH_MAX_SIZE)
+
+
+class BatchQueryItemModel(BaseModel):
+    address: str
+
+    result: Optional[QueryModel] = None
+    error: Optional[str] = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, field_validator
+from tronpy.keys import is_base58check_address
+
+
+class WatchedAddressCreateModel(BaseModel):
+    address: str
+
+    @field_validator("address")
+    @classmethod
+    def check_address(cls, address: str):
+        if not is_base58check_address(address):
+            raise ValueError(f"{address} is not a TRON address")
+
+        return address
+
+
+class WatchedAddressModel(WatchedAddressCreateModel):
+    id: int
@@ -0,0 +1,47 @@
+from typing import Awaitable, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import database_conf
+from config.settings import AGGREGATES_CACHE_SIZE, AGGREGATES_CACHE_TTL
+from core.cache import TTLCache, get_shared_backend
+
+aggregates_cache = TTLCache(
+    AGGREGATES_CACHE_TTL,
+    AGGREGATES_CACHE_SIZE,
+    get_shared_backend(),
+    "aggregates",
+    versioned=True,
+)
+
+
+async def get_cached_aggregate(
+    key: Hashable, aggregate: Callable[[AsyncSession], Awaitable]
+):
+    """
+    Runs an aggregate query at most once per `AGGREGATES_CACHE_TTL` seconds
+    for each key; concurrent requests for one key share a single query.
+
+    The query gets its own session because a shared fetch can outlive the
+    request that started it.
+
+    :param:
+    - `key`: Hashable description of the query and its filters.
+    - `aggregate`: Coroutine function running the query in the given session.
+
+    :return:
+        `Query result as plain dicts.`
+    """
+
+    async def fetch():
+        async with database_conf.SessionLocal() as session:
+            result = await aggregate(session)
+
+        if isinstance(result, list):
+            return [dict(row) for row in result]
+
+        return dict(result)
+
+    value, _, _ = await aggregates_cache.get_or_fetch(key, fetch)
+
+    return value
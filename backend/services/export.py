@@ -0,0 +1,66 @@
+import csv
+import io
+from datetime import datetime
+
+from config import database_conf
+from config.settings import EXPORT_CHUNK_SIZE
+from core.fastapi.responses import dump_json
+from core.sqlalchemy.crud import Crud
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def get_ndjson_chunk(fields: list, rows: list) -> str:
+    return "".join(dump_json(dict(zip(fields, row))).decode() + "\n" for row in rows)
+
+
+def get_csv_value(value):
+    # Same ISO format as the JSON endpoints, e.g. "2026-10-16T12:00:00Z"
+    if isinstance(value, datetime):
+        return dump_json(value).decode().strip('"')
+
+    return value
+
+
+def get_csv_chunk(fields: list, rows: list, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header:
+        writer.writerow(fields)
+
+    writer.writerows([get_csv_value(value) for value in row] for row in rows)
+
+    return buffer.getvalue()
+
+
+async def stream_export(crud: Crud, export_format: str, filters: list = None):
+    """
+    Streams all rows matching the filters as NDJSON or CSV text chunks.
+
+    The generator opens its own session because it is consumed by
+    `StreamingResponse` after the request dependencies have been closed.
+
+    :param:
+    - `crud`: Crud of the exported table.
+    - `export_format`: "ndjson" or "csv".
+    - `filters`: SQLAlchemy filter expressions.
+
+    :return:
+        `Async iterator of text chunks, one per fetched batch of rows.`
+    """
+    fields = crud.model.__table__.columns.keys()
+
+    async with database_conf.SessionLocal() as session:
+        is_first = True
+
+        async for rows in crud.stream(session, filters, EXPORT_CHUNK_SIZE):
+            if export_format == "csv":
+                yield get_csv_chunk(fields, rows, header=is_first)
+            else:
+                yield get_ndjson_chunk(fields, rows)
+
+            is_first = False
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Hashable, Optional
+
+from config import database_conf
+from config.settings import QUERIES_CACHE_SIZE, QUERIES_CACHE_TTL
+from core.cache import TTLCache, get_shared_backend
+from core.sqlalchemy.crud import Crud
+from core.fastapi.responses import dump_json
+from models.address_query import get_query_row
+from services.aggregates import aggregates_cache
+
+queries_cache = TTLCache(
+    QUERIES_CACHE_TTL,
+    QUERIES_CACHE_SIZE,
+    get_shared_backend(),
+    "queries",
+    versioned=True,
+)
+
+
+async def get_queries_state(crud: Crud):
+    """
+    Returns the id and creation time of the newest row, which change with every
+    insert and serve as the validators of query list responses.
+
+    Cached in `queries_cache`, so polls between inserts do not reach Postgres.
+
+    :return:
+        `Tuple of the newest id (0 for an empty table) and its created_at or None.`
+    """
+
+    async def fetch():
+        async with database_conf.SessionLocal() as session:
+            newest = await crud.last(session)
+
+        if newest is None:
+            return 0, None
+
+        return newest.id, newest.created_at.isoformat()
+
+    (newest_id, created_at), _, _ = await queries_cache.get_or_fetch("state", fetch)
+
+    return newest_id, datetime.fromisoformat(created_at) if created_at else None
+
+
+async def get_cached_page(
+    crud: Crud, key: Hashable, limit: int, after: Optional[str] = None, **kwargs
+):
+    """
+    Same as `Crud.paginate`, but returns the serialized `QueryPageModel` body,
+    served from `queries_cache` until the TTL passes or new snapshots are written.
+
+    Rows are fetched as mappings and encoded with orjson, without ORM objects
+    or model validation.
+
+    :param:
+    - `crud`: Crud of the listed table.
+    - `key`: Hashable description of the filters and sorting in `kwargs`.
+    - `limit`, `after`, `kwargs`: Passed to `Crud.paginate`.
+
+    :return:
+        `JSON text of the page.`
+    """
+
+    async def fetch():
+        async with database_conf.SessionLocal() as session:
+            items, next_cursor = await crud.paginate(
+                session, limit, after, as_rows=True, **kwargs
+            )
+
+        return dump_json(
+            {
+                "items": [get_query_row(item) for item in items],
+                "next_cursor": next_cursor,
+            }
+        ).decode()
+
+    body, _, _ = await queries_cache.get_or_fetch(("page", key, limit, after), fetch)
+
+    return body
+
+
+async def invalidate_queries(rows: list = None):
+    """
+    Drops cached query lists and aggregates in every worker sharing the backend.
+
+    Called after new snapshots are written; takes the written rows so it can
+    serve as the `on_flush` callback of `WriteBehindBuffer`.
+    """
+    await queries_cache.invalidate()
+    await aggregates_cache.invalidate()
@@ -1,12 +1,127 @@
-from tronpy.tron import Tron
+import asyncio
 
+import httpx
+from fastapi import Request
+from tronpy import AsyncTron
+from tronpy.defaults import conf_for_name
+from tronpy.providers import AsyncHTTPProvider
+from tronpy.providers.async_http import DEFAULT_API_KEY
 
-def get_tron_info(address: str):
-    tron = Tron()
-    account = tron.get_account(address)
+from config.settings import (
+    TRON_API_KEY,
+    TRON_BATCH_CONCURRENCY,
+    TRON_CACHE_SIZE,
+    TRON_CACHE_TTL,
+    TRON_KEEPALIVE_EXPIRY,
+    TRON_MAX_CONCURRENCY,
+    TRON_NETWORK,
+    TRON_POOL_SIZE,
+    TRON_PROVIDER_URI,
+    TRON_TIMEOUT,
+)
+from core.cache import TTLCache, get_shared_backend
+from core.metrics import tron_request_duration
 
-    trx_balance = account.get("balance", 0) / 1000000
+tron_semaphore = asyncio.Semaphore(TRON_MAX_CONCURRENCY)
+tron_cache = TTLCache(TRON_CACHE_TTL, TRON_CACHE_SIZE, get_shared_backend(), "tron")
+
+
+def create_tron_client(transport: httpx.AsyncBaseTransport = None) -> AsyncTron:
+    """
+    Creates a TRON client backed by a pooled keep-alive HTTP connection.
+
+    :param:
+    - `transport`: HTTP transport to use instead of the network one.
+
+    :return:
+        `AsyncTron client, closed with "await client.close()".`
+    """
+    client = httpx.AsyncClient(
+        headers={"Tron-Pro-Api-Key": TRON_API_KEY or DEFAULT_API_KEY},
+        limits=httpx.Limits(
+            max_connections=TRON_POOL_SIZE,
+            max_keepalive_connections=TRON_POOL_SIZE,
+            keepalive_expiry=TRON_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(TRON_TIMEOUT),
+        transport=transport,
+    )
+    endpoint = TRON_PROVIDER_URI or conf_for_name(TRON_NETWORK)
+
+    return AsyncTron(AsyncHTTPProvider(endpoint, client=client))
+
+
+def get_tron(request: Request):
+    return getattr(request.app.state, "tron", None)
+
+
+def parse_account(account: dict):
+    balance = account.get("balance", 0)
     bandwidth = account.get("bandwidth", 0)
     energy = account.get("energy", 0)
 
-    return trx_balance, bandwidth, energy
+    return balance, bandwidth, energy
+
+
+@tron_request_duration.time("get_account")
+async def get_tron_info(address: str, tron: AsyncTron = None):
+    """
+    Fetches account info from the TRON node without blocking the event loop.
+
+    At most `TRON_MAX_CONCURRENCY` lookups are in flight at the same time,
+    the rest wait for a free slot.
+
+    :param:
+    - `address`: TRON account address.
+    - `tron`: Shared client; a one-off client is created when omitted.
+
+    :return:
+        `Tuple of balance in SUN, bandwidth and energy.`
+    """
+    owns_client = tron is None
+
+    if owns_client:
+        tron = create_tron_client()
+
+    try:
+        async with tron_semaphore:
+            account = await tron.get_account(address)
+    finally:
+        if owns_client:
+            await tron.close()
+
+    return parse_account(account)
+
+
+async def get_cached_tron_info(address: str, tron: AsyncTron = None):
+    """
+    Same as `get_tron_info`, but served from `tron_cache` for `TRON_CACHE_TTL`
+    seconds; concurrent lookups of one address share a single node call.
+
+    :return:
+        `Tuple of account info, whether it was cached and its age in seconds.`
+    """
+    return await tron_cache.get_or_fetch(address, lambda: get_tron_info(address, tron))
+
+
+async def get_batch_tron_info(addresses: list, tron: AsyncTron = None):
+    """
+    Looks up many addresses concurrently, at most `TRON_BATCH_CONCURRENCY` at once.
+
+    A failed lookup does not interrupt the others.
+
+    :return:
+        `List of (account info, error) tuples in the order of addresses.`
+    """
+    semaphore = asyncio.Semaphore(TRON_BATCH_CONCURRENCY)
+
+    async def lookup(address: str):
+        async with semaphore:
+            try:
+                tron_info, _, _ = await get_cached_tron_info(address, tron)
+            except Exception as exc:
+                return None, f"{exc.__class__.__name__}: {exc}"
+
+        return tron_info, None
+
+    return await asyncio.gather(*(lookup(address) for address in addresses))
@@ -0,0 +1,232 @@
+import asyncio
+import random
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from tronpy import AsyncTron
+
+from core.loggers import logger
+from core.sqlalchemy.orm import Orm
+from services.queries import invalidate_queries
+from services.tron import get_tron_info, tron_cache
+from tables.address_query import AddressQuery
+from tables.watched_address import WatchedAddress
+
+# Advisory lock held by the one process that refreshes watched addresses
+WATCH_LOCK_KEY = 7_301_962_001
+
+
+class WatchScheduler:
+    """
+    Periodically refreshes watched addresses and stores changed snapshots.
+
+    Every `interval` seconds all watched addresses are looked up, at most
+    `concurrency` at a time and each after a random delay of up to `jitter`
+    seconds. Snapshots equal to the address's latest one are skipped, the rest
+    are inserted `batch_size` rows per statement.
+
+    With several workers only the one holding a Postgres advisory lock
+    refreshes; the others retry the lock every interval and take over when
+    its connection goes away.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory,
+        tron: AsyncTron = None,
+        interval: float = 60,
+        concurrency: int = 10,
+        jitter: float = 5,
+        batch_size: int = 500,
+    ):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.tron = tron
+
+        self.interval = interval
+        self.concurrency = concurrency
+        self.jitter = min(jitter, interval)
+        self.batch_size = batch_size
+
+        self.last_snapshots: dict[str, tuple] = {}
+        self.lock_connection = None
+        self.task = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+
+        self.task.cancel()
+
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.task = None
+        await self.release_lock()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started = loop.time()
+
+            try:
+                if await self.acquire_lock():
+                    await self.refresh()
+            except Exception:
+                logger.error("Watched addresses refresh failed", exc_info=True)
+
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def acquire_lock(self) -> bool:
+        """
+        Method that takes or confirms the refresh lock.
+
+        The lock is session-level, so it is held on a dedicated `engine`
+        connection kept out of the pool between refreshes.
+
+        :return:
+            `Whether this process should refresh.`
+        """
+        if self.lock_connection is not None:
+            try:
+                await self.lock_connection.execute(select(1))
+                await self.lock_connection.commit()
+                return True
+            except Exception:
+                logger.warning("Watch lock connection lost", exc_info=True)
+                await self.lock_connection.invalidate()
+                self.lock_connection = None
+
+        connection = await self.engine.connect()
+
+        try:
+            locked = await connection.scalar(
+                select(func.pg_try_advisory_lock(WATCH_LOCK_KEY))
+            )
+            await connection.commit()
+        except BaseException:
+            await connection.close()
+            raise
+
+        if not locked:
+            await connection.close()
+            return False
+
+        self.lock_connection = connection
+        # Another process may have stored snapshots while this one was idle
+        self.last_snapshots = {}
+
+        return True
+
+    async def release_lock(self):
+        if self.lock_connection is None:
+            return
+
+        try:
+            await self.lock_connection.scalar(
+                select(func.pg_advisory_unlock(WATCH_LOCK_KEY))
+            )
+            await self.lock_connection.close()
+        except Exception:
+            await self.lock_connection.invalidate()
+
+        self.lock_connection = None
+
+    async def refresh(self):
+        async with self.session_factory() as session:
+            execution = await session.execute(select(WatchedAddress.address))
+            addresses = execution.scalars().all()
+
+            await self.load_last_snapshots(addresses, session)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        snapshots = await asyncio.gather(
+            *(self.refresh_address(address, semaphore) for address in addresses)
+        )
+
+        rows = []
+        for address, snapshot in zip(addresses, snapshots):
+            if snapshot is None or not self.is_changed(address, snapshot):
+                continue
+
+            balance, bandwidth, energy = snapshot
+            rows.append(
+                {
+                    "address": address,
+                    "balance": balance,
+                    "bandwidth": bandwidth,
+                    "energy": energy,
+                }
+            )
+
+        async with self.session_factory() as session:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                await Orm.insert(AddressQuery, batch, session)
+
+                # Remembered only once stored, so a failed insert is retried
+                for row in batch:
+                    self.last_snapshots[row["address"]] = (
+                        row["balance"],
+                        row["bandwidth"],
+                        row["energy"],
+                    )
+
+        if rows:
+            await invalidate_queries()
+
+        return len(rows)
+
+    async def load_last_snapshots(self, addresses: list, session):
+        watched = set(addresses)
+        self.last_snapshots = {
+            address: snapshot
+            for address, snapshot in self.last_snapshots.items()
+            if address in watched
+        }
+
+        missing = watched - self.last_snapshots.keys()
+        if not missing:
+            return
+
+        query = (
+            select(
+                AddressQuery.address,
+                AddressQuery.balance,
+                AddressQuery.bandwidth,
+                AddressQuery.energy,
+            )
+            .where(AddressQuery.address.in_(missing))
+            .distinct(AddressQuery.address)
+            .order_by(AddressQuery.address, AddressQuery.id.desc())
+        )
+        execution = await session.execute(query)
+
+        for address, *snapshot in execution.all():
+            self.last_snapshots[address] = tuple(snapshot)
+
+    async def refresh_address(self, address: str, semaphore: asyncio.Semaphore):
+        await asyncio.sleep(random.uniform(0, self.jitter))
+
+        async with semaphore:
+            try:
+                tron_info = await get_tron_info(address, self.tron)
+            except Exception as exc:
+                logger.warning(
+                    "Watched address refresh failed", address=address, error=repr(exc)
+                )
+                return None
+
+        await tron_cache.set(address, tron_info)
+
+        return tron_info
+
+    def is_changed(self, address: str, snapshot: tuple):
+        return self.last_snapshots.get(address) != snapshot
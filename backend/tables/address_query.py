@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, func
 
 from config.database_conf import Base
 
@@ -8,8 +8,24 @@ class AddressQuery(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    address = Column(String, index=True)
-    trx_balance = Column(Float)
+    address = Column(String)
+    # in SUN, 1 TRX = 1,000,000 SUN
+    balance = Column(BigInteger, nullable=False)
 
     bandwidth = Column(Integer)
     energy = Column(Integer)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_address_queries_address_id", address, id.desc()),
+        Index("ix_address_queries_address_created_at", address, created_at),
+        Index("ix_address_queries_balance_id", balance, id),
+        Index(
+            "ix_address_queries_created_at_brin",
+            created_at,
+            postgresql_using="brin",
+        ),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+
+from config.database_conf import Base
+
+
+class WatchedAddress(Base):
+    __tablename__ = "watched_addresses"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    address = Column(String, unique=True, nullable=False)
@@ -1,9 +1,24 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from config.settings import DATABASE_URL
+from core.sqlalchemy.query_stats import instrument_engine
 
 Base = declarative_base()
 
-engine = create_async_engine(DATABASE_URL, future=True, echo=True)
+engine = create_async_engine(DATABASE_URL, future=True, echo=False)
+instrument_engine(engine, 0)
 async_session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+APP_TABLES = ("address_queries", "watched_addresses")
+
+
+async def truncate_tables():
+    """
+    Empties the app tables. They come from the migrations (`alembic upgrade
+    head`) and are never created or dropped by tests, so modules can run in
+    any order against the same database.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(APP_TABLES)} RESTART IDENTITY"))
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Generator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from services.aggregates import aggregates_cache, get_cached_aggregate
+from tables.address_query import AddressQuery
+from tests.config import async_session, engine, truncate_tables
+from views import query_crud
+
+
+@pytest_asyncio.fixture(scope="session")
+def event_loop() -> Generator:
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO address_queries (address, balance, bandwidth, energy) "
+                "SELECT 'T' || (n % 3), n, 0, 0 FROM generate_series(1, 30) n"
+            )
+        )
+
+    await aggregates_cache.invalidate()
+
+    async with async_session() as session:
+        yield session
+
+    await truncate_tables()
+
+
+@pytest.mark.asyncio
+async def test_aggregate_latest_uses_newest_snapshot_per_address(db_session):
+    result = await query_crud.aggregate_latest(
+        db_session, "address", "balance", [AddressQuery.address != "T0"]
+    )
+
+    assert dict(result) == {"count": 2, "min": 28, "max": 29, "avg": 28.5, "sum": 57}
+
+
+@pytest.mark.asyncio
+async def test_aggregate_groups_by_field(db_session):
+    result = await query_crud.aggregate(db_session, "balance", "address")
+
+    assert [(row["address"], row["count"], row["sum"]) for row in result] == [
+        ("T0", 10, 165),
+        ("T1", 10, 145),
+        ("T2", 10, 155),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cached_aggregate_runs_query_once(db_session):
+    calls = []
+
+    async def aggregate(session):
+        calls.append(session)
+        return await query_crud.aggregate_latest(session, "address", "balance")
+
+    results = await asyncio.gather(
+        *(get_cached_aggregate(("latest",), aggregate) for _ in range(5))
+    )
+    results.append(await get_cached_aggregate(("latest",), aggregate))
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert results[0]["sum"] == 87
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from core.fastapi.auth import AuthEmail, TokenCache
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_when_rounds_change():
+    old_auth = AuthEmail("secret", dict, bcrypt_rounds=4)
+    new_auth = AuthEmail("secret", dict, bcrypt_rounds=5)
+
+    hashed = await old_auth.get_password_hash_async("password")
+
+    assert await old_auth.verify_and_update_password("password", hashed) == (True, None)
+    assert await new_auth.verify_and_update_password("wrong", hashed) == (False, None)
+
+    valid, new_hash = await new_auth.verify_and_update_password("password", hashed)
+
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+    assert await new_auth.verify_password_async("password", new_hash)
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    auth = AuthEmail("secret", dict, bcrypt_rounds=10, hash_concurrency=4)
+    hashed = auth.get_password_hash("password")
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    results = await asyncio.gather(
+        *(auth.verify_password_async("password", hashed) for _ in range(4))
+    )
+    ticker.cancel()
+
+    assert all(results)
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_hashing_rejects_calls_over_the_concurrency_cap():
+    auth = AuthEmail(
+        "secret", dict, bcrypt_rounds=10, hash_concurrency=1, hash_wait=0.01
+    )
+    hashed = auth.get_password_hash("password")
+
+    results = await asyncio.gather(
+        *(auth.verify_password_async("password", hashed) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert results[0] is True
+    assert all(
+        isinstance(result, HTTPException) and result.status_code == 503
+        for result in results[1:]
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_user_reuses_verified_token_until_revoked(monkeypatch):
+    auth = AuthEmail("secret", dict)
+    token = auth.create_jwt_token({"sub": "user@example.com"}, timedelta(hours=1))
+    decodes = 0
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        nonlocal decodes
+        decodes += 1
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    for _ in range(3):
+        assert await auth.get_request_user(token) == {"email": "user@example.com"}
+
+    assert decodes == 1
+
+    auth.revoke_token(token)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.get_request_user(token)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_token_cache_drops_expired_and_least_recent_tokens():
+    cache = TokenCache(2)
+    now = time.time()
+
+    cache.set("expired", {"exp": now - 1})
+    cache.set("no-exp", {"sub": "user"})
+
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+
+    cache.set("first", {"exp": now + 60})
+    cache.set("second", {"exp": now + 60})
+    cache.get("first")
+    cache.set("third", {"exp": now + 60})
+
+    assert cache.get("second") is None
+    assert cache.get("first") == {"exp": now + 60}
+    assert len(cache) == 2
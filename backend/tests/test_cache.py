@@ -0,0 +1,188 @@
+import asyncio
+import pickle
+
+import orjson
+import pytest
+import pytest_asyncio
+
+from benchmarks.fake_redis import FakeRedisServer
+from core.cache import MemoryBackend, RedisBackend, SQLiteBackend, TTLCache
+from core.redis import RedisClient
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend(100)
+
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), 100)
+        yield backend
+        await backend.close()
+
+    else:
+        async with FakeRedisServer() as url:
+            backend = RedisBackend(RedisClient(url))
+            yield backend
+            await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_coalesces_concurrent_misses():
+    cache = TTLCache(ttl=60, maxsize=10)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(
+        *(cache.get_or_fetch("key", fetch) for _ in range(10))
+    )
+
+    assert calls == 1
+    assert all(value == "value" and not cached for value, cached, _ in results)
+    assert cache.stats["coalesced"] == 9
+
+    value, cached, age = await cache.get_or_fetch("key", fetch)
+
+    assert (value, cached) == ("value", True)
+    assert 0 <= age < 60
+    assert cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_evict():
+    cache = TTLCache(ttl=0.05, maxsize=2)
+
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+
+    assert await cache.get("a") is None
+    assert cache.stats["evictions"] == 1
+
+    await asyncio.sleep(0.06)
+
+    assert await cache.get("c") is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_not_cached():
+    cache = TTLCache(ttl=60, maxsize=10)
+
+    async def fetch():
+        raise ValueError("node unavailable")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_fetch("key", fetch)
+
+    assert await cache.get("key") is None
+    assert not cache.in_flight
+
+
+@pytest.mark.asyncio
+async def test_backend_round_trips_and_expires(backend):
+    cache = TTLCache(ttl=0.2, maxsize=10, backend=backend, namespace="test")
+    value = [{"address": "T1", "balance": 104837000}, ["nested", None]]
+
+    await cache.set(("page", 10, None), value)
+    cached_value, age = await cache.get(("page", 10, None))
+
+    assert cached_value == value
+    assert 0 <= age < 0.2
+
+    await cache.invalidate(("page", 10, None))
+    assert await cache.get(("page", 10, None)) is None
+
+    await cache.set("key", "value")
+    await asyncio.sleep(0.25)
+
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_versioned_invalidate_is_shared_between_caches(backend):
+    first = TTLCache(60, 10, backend, "queries", versioned=True)
+    second = TTLCache(60, 10, backend, "queries", versioned=True)
+
+    await first.set("page", "stale")
+    assert (await second.get("page"))[0] == "stale"
+
+    await second.invalidate()
+
+    assert await first.get("page") is None
+    assert await second.get("page") is None
+
+
+@pytest.mark.asyncio
+async def test_entries_are_json_and_foreign_data_reads_as_miss(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), 100)
+    cache = TTLCache(60, 10, backend, "test")
+
+    await cache.set("key", {"balance": 1})
+    row = await backend.run(
+        lambda: backend.connect().execute("SELECT value FROM cache").fetchone()
+    )
+
+    assert orjson.loads(row[0])[1] == {"balance": 1}
+
+    await backend.run(
+        lambda: backend.connect().execute(
+            "UPDATE cache SET value = ?", (pickle.dumps(("stored_at", "value")),)
+        )
+    )
+
+    assert await cache.get("key") is None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_retries_stale_connection_and_times_out():
+    async with FakeRedisServer() as url:
+        client = RedisClient(url)
+        await client.execute("SET", "key", b"value")
+
+        # Looks to the client like the server closed the idle connection
+        stale = client.idle[0]
+        stale[0].feed_eof()
+
+        assert await client.execute("GET", "key") == b"value"
+        assert client.idle[0] is not stale
+        await client.close()
+
+    async def hang(reader, writer):
+        await reader.read()
+
+    server = await asyncio.start_server(hang, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client = RedisClient(f"redis://127.0.0.1:{port}/0", timeout=0.1)
+
+    with pytest.raises(TimeoutError):
+        await client.execute("GET", "key")
+
+    server.close()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_backend_falls_back_to_fetch():
+    async with FakeRedisServer() as url:
+        pass
+
+    backend = RedisBackend(RedisClient(url, timeout=0.1))
+    cache = TTLCache(60, 10, backend, "queries", versioned=True)
+
+    async def fetch():
+        return "value"
+
+    assert await cache.get_or_fetch("key", fetch) == ("value", False, 0.0)
+    assert await cache.get("key") is None
+
+    await cache.set("key", "value")
+    await cache.invalidate()
+
+    assert cache.stats["errors"] == 4
+    await backend.close()
@@ -4,7 +4,7 @@ from typing import Generator
 import pytest
 import pytest_asyncio
 
-from tests.config import engine, Base, async_session
+from tests.config import async_session, truncate_tables
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -16,14 +16,10 @@ def event_loop() -> Generator:
 
 @pytest_asyncio.fixture(scope="module")
 async def db_session():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
     async with async_session() as session:
         yield session
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    await truncate_tables()
 
 
 @pytest.mark.asyncio
@@ -32,7 +28,7 @@ async def test_insert_query(db_session):
 
     query_data = {
         "address": "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz",
-        "trx_balance": 104.837,
+        "balance": 104837000,
         "bandwidth": 0,
         "energy": 0,
     }
@@ -45,6 +41,6 @@ async def test_insert_query(db_session):
 
     assert saved_query is not None
     assert saved_query.address == query_data["address"]
-    assert saved_query.trx_balance == query_data["trx_balance"]
+    assert saved_query.balance == query_data["balance"]
     assert saved_query.bandwidth == query_data["bandwidth"]
     assert saved_query.energy == query_data["energy"]
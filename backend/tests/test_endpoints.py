@@ -4,8 +4,12 @@ from typing import Generator
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+
+from benchmarks.fake_node import create_fake_node
+from core.sqlalchemy.query_stats import assert_max_queries
 from main import app
-from tests.config import engine, Base, async_session
+from services.tron import create_tron_client
+from tests.config import truncate_tables
 
 
 @pytest.fixture(scope="session")
@@ -15,25 +19,26 @@ def event_loop() -> Generator:
     loop.close()
 
 
-@pytest.fixture(scope="module")
-async def db_session():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    async with async_session() as session:
-        yield session
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def clean_tables():
+    yield
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    await truncate_tables()
 
 
 @pytest_asyncio.fixture(scope="function")
 async def async_client():
+    # TRON lookups go to the in-process fake node instead of the network
+    app.state.tron = create_tron_client(ASGITransport(app=create_fake_node()))
+
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as client:
         yield client
 
+    await app.state.tron.close()
+    app.state.tron = None
+
 
 @pytest.mark.asyncio
 async def test_create_query(async_client):
@@ -44,16 +49,174 @@ async def test_create_query(async_client):
 
     assert response.status_code == 200
     assert response_json.get("address") == "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
-    assert response_json.get("trx_balance") == 104.837
+    assert response_json.get("balance") == 104837000
+    assert response_json.get("trx_balance") == "104.837"
     assert response_json.get("bandwidth") == 0
     assert response_json.get("energy") == 0
     assert response_json.get("id") is not None
 
 
+@pytest.mark.asyncio
+async def test_create_queries_batch(async_client):
+    addresses = ["TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz", "invalid-address"]
+
+    response = await async_client.post("/queries/batch", json={"addresses": addresses})
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert [item.get("address") for item in response_json] == addresses
+    assert response_json[0].get("result").get("trx_balance") == "104.837"
+    assert response_json[0].get("result").get("id") is not None
+    assert response_json[0].get("error") is None
+    assert response_json[1].get("result") is None
+    assert response_json[1].get("error")
+
+
+@pytest.mark.asyncio
+async def test_create_queries_batch_matches_rows_to_addresses(async_client):
+    addresses = [
+        "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz",
+        "TNPeeaaFB7K9cmo4uQpcU32zGK8G1NYqeL",
+        "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7",
+    ] * 20
+
+    response = await async_client.post("/queries/batch", json={"addresses": addresses})
+    results = response.json()
+
+    for address in set(addresses):
+        history = await async_client.get(
+            "/queries/history", params={"address": address, "limit": 1000}
+        )
+        stored = {item["id"] for item in history.json()["items"]}
+        returned = {
+            item["result"]["id"] for item in results if item["address"] == address
+        }
+
+        assert returned <= stored
+
+
+@pytest.mark.asyncio
+async def test_get_latest_queries(async_client):
+    address = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+    created = await async_client.post("/queries/", params={"address": address})
+    response = await async_client.get(
+        "/queries/latest", params={"address": [address, "unknown-address"]}
+    )
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert len(response_json) == 1
+    assert response_json[0].get("id") == created.json().get("id")
+
+
 @pytest.mark.asyncio
 async def test_get_queries(async_client):
     response = await async_client.get("/queries/")
     response_json = response.json()
 
     assert response.status_code == 200
-    assert response_json
+    assert response_json.get("items")
+
+
+@pytest.mark.asyncio
+async def test_get_queries_cursor_pagination(async_client):
+    response = await async_client.get("/queries/", params={"limit": 1})
+    first_page = response.json()
+
+    assert response.status_code == 200
+    assert len(first_page.get("items")) == 1
+    assert first_page.get("next_cursor")
+
+    response = await async_client.get(
+        "/queries/", params={"limit": 1, "after": first_page.get("next_cursor")}
+    )
+    second_page = response.json()
+
+    assert response.status_code == 200
+    assert second_page.get("items")[0].get("id") > first_page.get("items")[0].get("id")
+
+
+@pytest.mark.asyncio
+async def test_get_query_history_buckets(async_client):
+    address = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+    await async_client.post("/queries/", params={"address": address})
+    response = await async_client.get(
+        "/queries/history/buckets", params={"address": address, "bucket": 3600}
+    )
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert response_json[-1].get("last") == 104837000
+    assert sum(bucket.get("count") for bucket in response_json) >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_address_aggregates_requires_addresses(async_client):
+    address = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+    await async_client.post("/queries/", params={"address": address})
+    response = await async_client.get("/queries/aggregates/addresses")
+
+    assert response.status_code == 422
+
+    response = await async_client.get(
+        "/queries/aggregates/addresses",
+        params={"address": [address, "unknown-address"]},
+    )
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert [row.get("address") for row in response_json] == [address]
+
+
+@pytest.mark.asyncio
+async def test_get_queries_not_modified(async_client):
+    response = await async_client.get("/queries/")
+    etag = response.headers.get("etag")
+
+    assert response.status_code == 200
+    assert etag
+
+    response = await async_client.get("/queries/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert not response.content
+
+    await async_client.post(
+        "/queries/", params={"address": "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"}
+    )
+    response = await async_client.get("/queries/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers.get("etag") != etag
+
+
+@pytest.mark.asyncio
+async def test_get_query_history_rows_match_model(async_client):
+    address = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+    await async_client.post("/queries/", params={"address": address})
+    latest = await async_client.get("/queries/latest", params={"address": address})
+    history = await async_client.get(
+        "/queries/history", params={"address": address, "limit": 1000}
+    )
+
+    assert history.status_code == 200
+    assert history.json().get("items")[-1] == latest.json()[0]
+
+
+@pytest.mark.asyncio
+async def test_query_endpoints_round_trips(async_client):
+    with assert_max_queries(1):
+        response = await async_client.post(
+            "/queries/", params={"address": "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"}
+        )
+
+    assert response.status_code == 200
+
+    with assert_max_queries(2):
+        response = await async_client.get("/queries/")
+
+    assert response.status_code == 200
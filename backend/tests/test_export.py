@@ -0,0 +1,80 @@
+import asyncio
+import json
+import tracemalloc
+from typing import Generator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from services.export import stream_export
+from tests.config import engine, truncate_tables
+from views import query_crud
+
+
+@pytest_asyncio.fixture(scope="session")
+def event_loop() -> Generator:
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def generate_queries():
+    async def generate(count: int):
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE address_queries"))
+            await conn.execute(
+                text(
+                    "INSERT INTO address_queries (address, balance, bandwidth, energy) "
+                    "SELECT 'T' || n, n, 0, 0 FROM generate_series(1, :count) n"
+                ),
+                {"count": count},
+            )
+
+    yield generate
+
+    await truncate_tables()
+
+
+async def get_export_peak_memory(export_format: str):
+    lines = 0
+
+    tracemalloc.start()
+
+    async for chunk in stream_export(query_crud, export_format):
+        lines += chunk.count("\n")
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return lines, peak
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format, header_lines", [("ndjson", 0), ("csv", 1)])
+async def test_export_memory_does_not_grow_with_table(
+    generate_queries, export_format, header_lines
+):
+    await generate_queries(5000)
+    small_lines, small_peak = await get_export_peak_memory(export_format)
+
+    await generate_queries(50000)
+    large_lines, large_peak = await get_export_peak_memory(export_format)
+
+    assert small_lines == 5000 + header_lines
+    assert large_lines == 50000 + header_lines
+    assert large_peak < small_peak * 1.5
+
+
+@pytest.mark.asyncio
+async def test_export_formats_datetimes_like_the_api(generate_queries):
+    await generate_queries(1)
+
+    ndjson = [chunk async for chunk in stream_export(query_crud, "ndjson")]
+    csv = [chunk async for chunk in stream_export(query_crud, "csv")]
+
+    created_at = json.loads(ndjson[0])["created_at"]
+
+    assert "T" in created_at and created_at.endswith("Z")
+    assert created_at in csv[0]
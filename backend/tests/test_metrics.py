@@ -0,0 +1,45 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from core.metrics import Histogram
+from main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+
+    histogram.observe(0.05, "/queries/")
+    histogram.observe(0.5, "/queries/")
+    histogram.observe(5, "/queries/")
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{route="/queries/",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/queries/",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/queries/",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/queries/"} 3' in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes_and_serialization():
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        await client.get("/metrics")
+        response = await client.get("/metrics")
+
+    lines = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert any(
+        line.startswith(
+            'http_request_duration_seconds_count{method="GET",route="/metrics",'
+            'status="200"}'
+        )
+        for line in lines
+    )
+    assert any(
+        line.startswith("response_serialization_duration_seconds_count ")
+        and int(line.split()[-1]) >= 1
+        for line in lines
+    )
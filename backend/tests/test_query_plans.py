@@ -0,0 +1,153 @@
+import asyncio
+from typing import Generator
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import Column, Integer, String, text
+from sqlalchemy.dialects import postgresql
+
+from core.sqlalchemy.crud import Crud
+from core.sqlalchemy.orm import Orm
+from core.sqlalchemy.query_stats import assert_max_queries
+from tests.config import Base as TestBase
+from tests.config import async_session, engine, truncate_tables
+from views import QUERIES_SORT_FIELDS, get_query_filters, query_crud
+
+FILTERS = [
+    {},
+    {"address": "T7"},
+    {"min_balance": 1000, "max_balance": 2000},
+    {"min_balance": 500000},
+    {"address": "T7", "min_balance": 1000},
+]
+
+
+class UniqueItem(TestBase):
+    __tablename__ = "unique_items"
+
+    id = Column(Integer, primary_key=True)
+
+    code = Column(String, unique=True, nullable=False)
+    slug = Column(String, unique=True, nullable=False)
+
+
+@pytest_asyncio.fixture(scope="session")
+def event_loop() -> Generator:
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def generated_queries():
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO address_queries (address, balance, bandwidth, energy) "
+                "SELECT 'T' || (n % 1000), (n * 7919) % 1000000, 0, 0 "
+                "FROM generate_series(1, 200000) n"
+            )
+        )
+        await conn.execute(text("ANALYZE address_queries"))
+
+    yield
+
+    await truncate_tables()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def generated_items():
+    async with engine.begin() as conn:
+        await conn.run_sync(UniqueItem.__table__.create)
+        await conn.execute(
+            text(
+                "INSERT INTO unique_items (id, code, slug) "
+                "SELECT n, 'C' || n, 'S' || n FROM generate_series(1, 200000) n"
+            )
+        )
+        await conn.execute(text("ANALYZE unique_items"))
+
+    yield
+
+    async with engine.begin() as conn:
+        await conn.run_sync(UniqueItem.__table__.drop)
+
+
+async def explain(query) -> str:
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+    async with engine.connect() as conn:
+        execution = await conn.execute(text(f"EXPLAIN {sql}"))
+
+    return "\n".join(execution.scalars().all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("sort_field", QUERIES_SORT_FIELDS)
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("after", [None, [500000, 100000]])
+async def test_list_query_uses_indexes(
+    generated_queries, filters, sort_field, sort_order, after
+):
+    if after is not None:
+        columns = query_crud.get_sort_columns(sort_field)
+        after = query_crud.encode_cursor(after[-len(columns) :])
+
+    query = query_crud.get_list_query(
+        sort_field=sort_field,
+        sort_order=sort_order,
+        filters=get_query_filters(**filters),
+        after=after,
+        as_rows=True,
+        limit=101,
+    )
+    plan = await explain(query)
+
+    assert "Seq Scan" not in plan, plan
+
+
+def test_unsupported_sort_field_is_rejected():
+    with pytest.raises(Exception) as error:
+        query_crud.get_list_query(sort_field="address")
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_filter_by_exclusion_uses_indexes(generated_items):
+    query = await Orm.filter_by(
+        UniqueItem, {"code": "C7"}, None, exclude_data={"id": 7}, execute=False
+    )
+    plan = await explain(query)
+
+    assert "EXCEPT" not in str(query)
+    assert "Seq Scan" not in plan and "SetOp" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_unique_check_uses_indexes(generated_items):
+    query = Crud.get_unique_query(UniqueItem, {"code": "C7", "slug": "S9"}, 7)
+    plan = await explain(query)
+
+    assert "Seq Scan" not in plan, plan
+    assert "unique_items_code_key" in plan and "unique_items_slug_key" in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_unique_fields_are_checked_in_one_query(generated_items):
+    async with async_session() as session:
+        with assert_max_queries(1):
+            await Crud.check_unique_fields(
+                UniqueItem, {"code": "C7", "slug": "S7"}, session, obj_id=7
+            )
+
+        with assert_max_queries(1), pytest.raises(HTTPException) as error:
+            await Crud.check_unique_fields(
+                UniqueItem, {"code": "new", "slug": "S9"}, session, obj_id=7
+            )
+
+    assert error.value.detail == "UniqueItem with slug=S9 already exists"
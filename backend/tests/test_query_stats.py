@@ -0,0 +1,53 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config.settings import DATABASE_URL
+from core.fastapi.metrics import QueryStatsMiddleware
+from core.sqlalchemy import query_stats
+from core.sqlalchemy.query_stats import assert_max_queries, instrument_engine
+
+
+@pytest.mark.asyncio
+async def test_statements_are_counted_per_request_and_slow_ones_explained(
+    monkeypatch,
+):
+    warnings = []
+    monkeypatch.setattr(
+        query_stats.logger, "warning", lambda message, **fields: warnings.append(fields)
+    )
+
+    engine = create_async_engine(DATABASE_URL)
+    instrument_engine(engine, 0.000001)
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/")
+    async def index():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(
+                text("SELECT CAST(:value AS integer)"), {"value": 2}
+            )
+
+        return {}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/")
+
+        with pytest.raises(AssertionError, match="2 queries executed"):
+            with assert_max_queries(1):
+                await client.get("/")
+
+    await engine.dispose()
+
+    assert response.headers["x-db-query-count"] == "2"
+    assert float(response.headers["x-db-query-time"]) > 0
+    assert warnings[0]["statement"] == "SELECT 1"
+    assert warnings[0]["plan"].startswith("Result")
+    assert len(warnings) == 4
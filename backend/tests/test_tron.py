@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from services import tron as tron_service
+
+ADDRESS = "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz"
+
+
+def stub_node_client(latency: float, state: dict):
+    async def handler(request: httpx.Request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+
+        await asyncio.sleep(latency)
+
+        state["in_flight"] -= 1
+        address = json.loads(request.content)["address"]
+
+        return httpx.Response(
+            200, json={"address": address, "balance": 104837000, "bandwidth": 0}
+        )
+
+    return tron_service.create_tron_client(httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_get_tron_info_parses_account():
+    state = {"in_flight": 0, "max_in_flight": 0}
+    tron = stub_node_client(0, state)
+
+    assert await tron_service.get_tron_info(ADDRESS, tron) == (104837000, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_get_tron_info_does_not_block_event_loop(monkeypatch):
+    latency, requests_count, concurrency = 0.1, 20, 5
+    state = {"in_flight": 0, "max_in_flight": 0}
+    tron = stub_node_client(latency, state)
+
+    monkeypatch.setattr(tron_service, "tron_semaphore", asyncio.Semaphore(concurrency))
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+
+    results = await asyncio.gather(
+        *(tron_service.get_tron_info(ADDRESS, tron) for _ in range(requests_count))
+    )
+
+    elapsed = time.perf_counter() - started
+    heartbeat_task.cancel()
+
+    assert len(results) == requests_count
+    assert state["max_in_flight"] == concurrency
+    assert elapsed < latency * requests_count / 2
+    assert ticks >= elapsed / 0.01 / 2
@@ -0,0 +1,95 @@
+import asyncio
+import json
+from typing import Generator
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from core.sqlalchemy.orm import Orm
+from services.tron import create_tron_client, tron_cache
+from services.watcher import WatchScheduler
+from tables.address_query import AddressQuery
+from tables.watched_address import WatchedAddress
+from tests.config import async_session, engine, truncate_tables
+
+ADDRESSES = ["TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz", "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf"]
+
+
+@pytest_asyncio.fixture(scope="session")
+def event_loop() -> Generator:
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    async with async_session() as session:
+        session.add_all(WatchedAddress(address=address) for address in ADDRESSES)
+        await session.commit()
+
+        yield session
+
+    await truncate_tables()
+    # Refreshes store the stubbed balances for other modules' addresses too
+    await tron_cache.invalidate()
+
+
+def stub_node_client(balances: dict):
+    def handler(request: httpx.Request):
+        address = json.loads(request.content)["address"]
+        return httpx.Response(200, json={"balance": balances[address]})
+
+    return create_tron_client(httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_refresh_stores_only_changed_snapshots(db_session):
+    balances = dict.fromkeys(ADDRESSES, 1000000)
+    scheduler = WatchScheduler(
+        engine, async_session, stub_node_client(balances), jitter=0
+    )
+
+    assert await scheduler.refresh() == 2
+    assert await scheduler.refresh() == 0
+
+    balances[ADDRESSES[0]] = 2000000
+
+    assert await scheduler.refresh() == 1
+    assert await db_session.scalar(select(func.count()).select_from(AddressQuery)) == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_retries_snapshots_whose_insert_failed(db_session, monkeypatch):
+    balances = dict.fromkeys(ADDRESSES, 1000000)
+    scheduler = WatchScheduler(
+        engine, async_session, stub_node_client(balances), jitter=0
+    )
+
+    async def failing_insert(*args, **kwargs):
+        raise ConnectionError("database is unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Orm, "insert", failing_insert)
+
+        with pytest.raises(ConnectionError):
+            await scheduler.refresh()
+
+    assert await scheduler.refresh() == 2
+
+
+@pytest.mark.asyncio
+async def test_only_one_scheduler_holds_the_refresh_lock(db_session):
+    first = WatchScheduler(engine, async_session)
+    second = WatchScheduler(engine, async_session)
+
+    assert await first.acquire_lock()
+    assert await first.acquire_lock()
+    assert not await second.acquire_lock()
+
+    await first.release_lock()
+
+    assert await second.acquire_lock()
+    await second.release_lock()
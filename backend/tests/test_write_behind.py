@@ -0,0 +1,118 @@
+import asyncio
+from typing import Generator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from core.sqlalchemy.write_behind import WriteBehindBuffer
+from tables.address_query import AddressQuery
+from tests.config import async_session, truncate_tables
+
+QUERY_DATA = {
+    "address": "TRjE1H8dxypKM1NZRdysbs9wo7huR4bdNz",
+    "balance": 104837000,
+    "bandwidth": 0,
+    "energy": 0,
+}
+
+
+@pytest_asyncio.fixture(scope="session")
+def event_loop() -> Generator:
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    async with async_session() as session:
+        yield session
+
+    await truncate_tables()
+
+
+async def count_queries(session):
+    return await session.scalar(select(func.count()).select_from(AddressQuery))
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_full_batches(db_session):
+    buffer = WriteBehindBuffer(
+        AddressQuery, async_session, max_rows=10, flush_interval=60
+    )
+    await buffer.start()
+
+    for _ in range(25):
+        await buffer.put(QUERY_DATA)
+
+    await asyncio.sleep(0.5)
+    assert await count_queries(db_session) == 20
+
+    await buffer.stop()
+    assert await count_queries(db_session) == 25
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_after_interval(db_session):
+    buffer = WriteBehindBuffer(
+        AddressQuery, async_session, max_rows=10, flush_interval=0.05
+    )
+    await buffer.start()
+
+    await buffer.put(QUERY_DATA)
+    await asyncio.sleep(0.5)
+
+    assert await count_queries(db_session) == 1
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_buffer_applies_backpressure(db_session):
+    buffer = WriteBehindBuffer(AddressQuery, async_session, max_rows=10, max_size=5)
+
+    for _ in range(5):
+        buffer.queue.put_nowait(QUERY_DATA)
+
+    buffer.task = asyncio.get_running_loop().create_future()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(buffer.put(QUERY_DATA), 0.05)
+
+
+@pytest.mark.asyncio
+async def test_buffer_retries_failed_batches_and_keeps_them_pending(db_session):
+    failures = 3
+
+    def session_factory():
+        nonlocal failures
+
+        if failures:
+            failures -= 1
+            raise ConnectionError("database is unavailable")
+
+        return async_session()
+
+    buffer = WriteBehindBuffer(
+        AddressQuery,
+        session_factory,
+        max_rows=10,
+        flush_interval=0.01,
+        max_size=2,
+        retry_delay=0.05,
+    )
+    await buffer.start()
+
+    await buffer.put(QUERY_DATA)
+    await buffer.put(QUERY_DATA)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(buffer.put(QUERY_DATA), 0.05)
+
+    await asyncio.sleep(1)
+    assert failures == 0
+    assert await count_queries(db_session) == 2
+
+    await buffer.put(QUERY_DATA)
+    await buffer.stop()
+    assert await count_queries(db_session) == 3
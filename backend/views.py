@@ -1,40 +1,352 @@
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from tronpy import AsyncTron
 
-from config.database_conf import get_session
+from config.database_conf import get_pool_stats, get_query_buffer, get_session
+from config.settings import (
+    AGGREGATES_MAX_ADDRESSES,
+    LATEST_MAX_ADDRESSES,
+    QUERIES_MAX_PAGE_SIZE,
+    QUERIES_PAGE_SIZE,
+)
+from core.fastapi.conditional import get_validator_headers, is_not_modified
+from core.fastapi.metrics import TimedRoute
+from core.fastapi.responses import ORJSONResponse
+from core.metrics import render_gauges, render_metrics
 from core.sqlalchemy.crud import Crud
-from models.address_query import QueryModel
-from services.tron import get_tron_info
+from core.sqlalchemy.write_behind import WriteBehindBuffer
+from models.address_query import (
+    BatchQueryItemModel,
+    BatchQueryModel,
+    QueryAddressAggregateModel,
+    QueryAggregateModel,
+    QueryBulkCreateModel,
+    QueryBucketModel,
+    QueryModel,
+    QueryPageModel,
+    QueryResultModel,
+    get_query_row,
+)
+from models.watched_address import WatchedAddressCreateModel, WatchedAddressModel
+from services.aggregates import aggregates_cache, get_cached_aggregate
+from services.export import EXPORT_MEDIA_TYPES, stream_export
+from services.queries import (
+    get_cached_page,
+    get_queries_state,
+    invalidate_queries,
+    queries_cache,
+)
+from services.tron import (
+    get_batch_tron_info,
+    get_cached_tron_info,
+    get_tron,
+    tron_cache,
+)
 from tables.address_query import AddressQuery
+from tables.watched_address import WatchedAddress
 
-query_router = APIRouter()
-query_crud = Crud(AddressQuery)
+query_router = APIRouter(route_class=TimedRoute)
+watched_router = APIRouter(route_class=TimedRoute)
+stats_router = APIRouter(route_class=TimedRoute)
+metrics_router = APIRouter(route_class=TimedRoute)
 
+# Each leads an index on (field, id), see tables/address_query.py
+QUERIES_SORT_FIELDS = ["id", "balance"]
 
-@query_router.post("/", response_model=QueryModel)
+query_crud = Crud(AddressQuery, QUERIES_SORT_FIELDS)
+watched_crud = Crud(WatchedAddress)
+
+
+def get_query_filters(
+    address: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_balance: Optional[int] = None,
+    max_balance: Optional[int] = None,
+):
+    filters = []
+
+    if address is not None:
+        filters.append(AddressQuery.address == address)
+    if since is not None:
+        filters.append(AddressQuery.created_at >= since)
+    if until is not None:
+        filters.append(AddressQuery.created_at < until)
+    if min_balance is not None:
+        filters.append(AddressQuery.balance >= min_balance)
+    if max_balance is not None:
+        filters.append(AddressQuery.balance <= max_balance)
+
+    return filters
+
+
+@query_router.post("/", response_model=QueryResultModel)
 async def create_query_address(
     address: str,
     session: AsyncSession = Depends(get_session),
+    tron: AsyncTron = Depends(get_tron),
+    query_buffer: Optional[WriteBehindBuffer] = Depends(get_query_buffer),
 ):
-    trx_balance, bandwidth, energy = get_tron_info(address)
+    tron_info, cached, cache_age = await get_cached_tron_info(address, tron)
+    balance, bandwidth, energy = tron_info
 
-    return await query_crud.create(
-        {
-            "address": address,
-            "trx_balance": trx_balance,
-            "bandwidth": bandwidth,
-            "energy": energy
-        },
+    data = {
+        "address": address,
+        "balance": balance,
+        "bandwidth": bandwidth,
+        "energy": energy,
+    }
+
+    if query_buffer is not None:
+        await query_buffer.put(data)
+        return {**data, "cached": cached, "cache_age": cache_age}
+
+    instance = await query_crud.create(data, session)
+    await invalidate_queries()
+    instance.cached = cached
+    instance.cache_age = cache_age
+
+    return instance
+
+
+@query_router.post("/batch", response_model=List[BatchQueryItemModel])
+async def create_query_addresses(
+    data: BatchQueryModel,
+    session: AsyncSession = Depends(get_session),
+    tron: AsyncTron = Depends(get_tron),
+):
+    lookups = await get_batch_tron_info(data.addresses, tron)
+
+    queries = []
+    for address, (tron_info, error) in zip(data.addresses, lookups):
+        if tron_info is not None:
+            balance, bandwidth, energy = tron_info
+            queries.append(
+                {
+                    "address": address,
+                    "balance": balance,
+                    "bandwidth": bandwidth,
+                    "energy": energy,
+                }
+            )
+
+    created = {"queries": []}
+    if queries:
+        created = await query_crud.create_bulk(
+            QueryBulkCreateModel(queries=queries),
+            "queries",
+            session,
+            [AddressQuery.id, AddressQuery.created_at],
+        )
+        await invalidate_queries()
+
+    created_queries = iter(zip(queries, created["queries"]))
+    results = []
+
+    for address, (tron_info, error) in zip(data.addresses, lookups):
+        if tron_info is None:
+            results.append({"address": address, "error": error})
+        else:
+            query, row = next(created_queries)
+            results.append({"address": address, "result": {**query, **row}})
+
+    return results
+
+
+@query_router.get("/", response_model=QueryPageModel)
+async def get_queries(
+    request: Request,
+    address: Optional[str] = None,
+    min_balance: Optional[int] = Query(None, ge=0),
+    max_balance: Optional[int] = Query(None, ge=0),
+    sort: Literal["id", "balance"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    after: Optional[str] = None,
+    limit: int = Query(QUERIES_PAGE_SIZE, ge=1, le=QUERIES_MAX_PAGE_SIZE),
+):
+    newest_id, last_modified = await get_queries_state(query_crud)
+
+    etag = f'"{newest_id}"'
+    headers = get_validator_headers(etag, last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    body = await get_cached_page(
+        query_crud,
+        (address, min_balance, max_balance, sort, order),
+        limit,
+        after,
+        sort_field=sort,
+        sort_order=order,
+        filters=get_query_filters(
+            address, min_balance=min_balance, max_balance=max_balance
+        ),
+    )
+
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@query_router.get("/latest", response_model=List[QueryModel])
+async def get_latest_queries(
+    address: List[str] = Query(min_length=1, max_length=LATEST_MAX_ADDRESSES),
+    session: AsyncSession = Depends(get_session),
+):
+    return await query_crud.latest(session, "address", address)
+
+
+@query_router.get("/history", response_model=QueryPageModel)
+async def get_query_history(
+    address: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: int = Query(QUERIES_PAGE_SIZE, ge=1, le=QUERIES_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+):
+    items, next_cursor = await query_crud.paginate(
+        session,
+        limit,
+        after,
+        filters=get_query_filters(address, since, until),
+        as_rows=True,
+    )
+
+    return ORJSONResponse(
+        {"items": [get_query_row(item) for item in items], "next_cursor": next_cursor}
+    )
+
+
+@query_router.get("/history/buckets", response_model=List[QueryBucketModel])
+async def get_query_history_buckets(
+    address: str,
+    bucket: int = Query(ge=1),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    return await query_crud.downsample(
         session,
+        "created_at",
+        "balance",
+        bucket,
+        get_query_filters(address, since, until),
     )
 
 
-@query_router.get("/", response_model=List[QueryModel])
-async def get_queries(
-    offset: int = None,
-    limit: int = None,
+@query_router.get("/aggregates/latest", response_model=QueryAggregateModel)
+async def get_latest_aggregate(
+    address: List[str] = Query(None, max_length=AGGREGATES_MAX_ADDRESSES),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    filters = get_query_filters(None, since, until)
+    if address:
+        filters.append(AddressQuery.address.in_(address))
+
+    return await get_cached_aggregate(
+        ("latest", tuple(sorted(address or [])), since, until),
+        lambda session: query_crud.aggregate_latest(
+            session, "address", "balance", filters
+        ),
+    )
+
+
+@query_router.get(
+    "/aggregates/addresses", response_model=List[QueryAddressAggregateModel]
+)
+async def get_address_aggregates(
+    address: List[str] = Query(..., min_length=1, max_length=AGGREGATES_MAX_ADDRESSES),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    # One row per address, so the listed addresses bound the result
+    filters = get_query_filters(None, since, until)
+    filters.append(AddressQuery.address.in_(address))
+
+    return await get_cached_aggregate(
+        ("addresses", tuple(sorted(address)), since, until),
+        lambda session: query_crud.aggregate(session, "balance", "address", filters),
+    )
+
+
+@query_router.get("/export")
+async def export_queries(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    address: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+):
+    filters = get_query_filters(address, since, until)
+
+    if min_id is not None:
+        filters.append(AddressQuery.id >= min_id)
+    if max_id is not None:
+        filters.append(AddressQuery.id <= max_id)
+
+    return StreamingResponse(
+        stream_export(query_crud, export_format, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=queries.{export_format}"
+        },
+    )
+
+
+@query_router.get("/cache-stats")
+async def get_cache_stats():
+    return {
+        **tron_cache.get_stats(),
+        "queries": queries_cache.get_stats(),
+        "aggregates": aggregates_cache.get_stats(),
+    }
+
+
+@watched_router.post("/", response_model=WatchedAddressModel)
+async def create_watched_address(
+    data: WatchedAddressCreateModel,
     session: AsyncSession = Depends(get_session),
 ):
-    return await query_crud.list(session, offset=offset, limit=limit)
+    return await watched_crud.create(data, session)
+
+
+@watched_router.get("/", response_model=List[WatchedAddressModel])
+async def get_watched_addresses(session: AsyncSession = Depends(get_session)):
+    return await watched_crud.list(session)
+
+
+@watched_router.delete("/{obj_id}")
+async def delete_watched_address(
+    obj_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    return await watched_crud.delete(obj_id, session)
+
+
+@stats_router.get("/db-pool")
+async def get_db_pool_stats():
+    return get_pool_stats()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return render_metrics(
+        render_gauges(
+            "tron_cache", tron_cache.get_stats(), "TRON snapshot cache counter."
+        ),
+        render_gauges(
+            "queries_cache", queries_cache.get_stats(), "Query list cache counter."
+        ),
+        render_gauges(
+            "aggregates_cache",
+            aggregates_cache.get_stats(),
+            "Aggregate query cache counter.",
+        ),
+        render_gauges("db_pool", get_pool_stats(), "Database connection pool state."),
+    )